@@ -0,0 +1,97 @@
+"""
+bench/classifier_bench.py — Old chained categorize() vs the compiled classifier.
+
+Builds a synthetic corpus of job titles, checks that the compiled
+classifier returns exactly the same category as the legacy function (and
+the same skill tags as the SQL LIKE filter), then times both.
+
+    python -m bench.classifier_bench [n_titles]
+"""
+
+import random
+import sys
+import time
+
+from core.classifier import CLASSIFIER
+from db.database import SKILL_KEYWORDS
+
+
+def legacy_categorize(title: str) -> str:
+    t = title.lower()
+    if any(k in t for k in ["react", "next.js", "nextjs"]):             return "React"
+    if any(k in t for k in ["node", "express.js"]):                      return "Node.js"
+    if any(k in t for k in ["javascript", "typescript"]):                return "JavaScript"
+    if "python" in t:                                                     return "Python"
+    if any(k in t for k in ["java ", "java,", "spring boot", "kotlin"]): return "Java"
+    if any(k in t for k in ["machine learning", "deep learning", "nlp", "llm", "ai engineer"]): return "ML/AI"
+    if any(k in t for k in ["data scientist", "data science", "data analyst"]): return "Data Science"
+    if any(k in t for k in ["devops", "site reliability", "sre", "kubernetes", "docker", "platform engineer"]): return "DevOps"
+    if any(k in t for k in ["android", "kotlin developer"]):             return "Android"
+    if any(k in t for k in ["ios", "swift developer"]):                  return "iOS"
+    if any(k in t for k in ["qa engineer", "quality assurance", "test engineer", "sdet"]): return "Testing/QA"
+    if any(k in t for k in ["ui/ux", "ux designer", "product designer"]): return "UI/UX"
+    if any(k in t for k in ["full stack", "fullstack", "full-stack"]):   return "Full Stack"
+    if any(k in t for k in ["frontend", "front-end"]):                   return "Frontend"
+    if any(k in t for k in ["backend", "back-end"]):                     return "Backend"
+    return "Software Engineering"
+
+
+def legacy_skills(title: str, category: str) -> tuple:
+    """What the old LOWER(title|category) LIKE '%kw%' skill filter matched."""
+    t, c = title.lower(), category.lower()
+    return tuple(
+        skill for skill, kws in SKILL_KEYWORDS.items()
+        if kws and any(k in t or k in c for k in kws)
+    )
+
+
+SENIORITY = ["", "Senior ", "Staff ", "Principal ", "Junior ", "Lead ", "Sr. "]
+ROLES = [
+    "Software Engineer", "Software Developer", "Backend Engineer", "Frontend Developer",
+    "Full Stack Engineer", "Full-Stack Developer", "React Developer", "Node.js Engineer",
+    "Python Developer", "Java Developer", "Java, Spring Boot Engineer", "Kotlin Developer",
+    "Machine Learning Engineer", "ML Engineer", "AI Engineer", "LLM Researcher",
+    "Data Scientist", "Data Analyst", "Data Engineer", "Site Reliability Engineer",
+    "DevOps Engineer", "Platform Engineer", "Android Engineer", "iOS Developer",
+    "Swift Developer", "QA Engineer", "SDET", "Test Engineer", "Product Designer",
+    "UX Designer", "Account Executive", "Recruiter", "Solutions Architect",
+    "Engineering Manager", "Technical Writer", "Security Engineer", "Sales Manager",
+]
+SUFFIXES = ["", ", Payments", " - Infrastructure", " (Remote)", ", Kubernetes", " II",
+            " — TypeScript", ", Docker", " in Test", " / NextJS", ", NLP", ", Bioscience"]
+
+
+def corpus(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(SENIORITY) + rng.choice(ROLES) + rng.choice(SUFFIXES) for _ in range(n)]
+
+
+def _time(fn, titles) -> float:
+    start = time.perf_counter()
+    for t in titles:
+        fn(t)
+    return time.perf_counter() - start
+
+
+def main(n: int = 100_000):
+    titles = corpus(n)
+
+    for t in titles:
+        want_cat = legacy_categorize(t)
+        got_cat, got_skills = CLASSIFIER.classify(t)
+        assert got_cat == want_cat, (t, got_cat, want_cat)
+        assert got_skills == legacy_skills(t, want_cat), (t, got_skills)
+    print(f"✅ {n} titles: categories and skill tags match the legacy logic")
+
+    old_cat  = _time(legacy_categorize, titles)
+    new_cat  = _time(CLASSIFIER.categorize, titles)
+    old_full = _time(lambda t: legacy_skills(t, legacy_categorize(t)), titles)
+    new_full = _time(CLASSIFIER.classify, titles)
+
+    print(f"{'':<28}{'legacy':>10}{'compiled':>10}{'speedup':>9}")
+    print(f"{'category only':<28}{old_cat:>9.3f}s{new_cat:>9.3f}s{old_cat / new_cat:>8.1f}x")
+    print(f"{'category + skill tags':<28}{old_full:>9.3f}s{new_full:>9.3f}s{old_full / new_full:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
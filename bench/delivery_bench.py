@@ -0,0 +1,110 @@
+"""
+bench/delivery_bench.py — The delivery engine against a fake Bot API.
+
+FakeBotAPI enforces limits the way the real API does: more than
+GLOBAL_LIMIT messages in any second, or more than CHAT_LIMIT to one chat
+in a second, gets a RetryAfter instead of a delivery. CHAT_LIMIT is what
+the engine's per-chat buckets promise (see TokenBucket.allowance); alerts
+on their own are held to the tighter ALERT_LIMIT. A request counts from
+the moment it is made, so the check is exact rather than at the mercy of
+latency jitter. It answers after LATENCY seconds like a real round trip.
+
+Queues n_chats × alerts alert messages, then a few /search-sized
+interactive replies (a header plus 8 cards) while the alerts are in
+flight, and checks that every message arrived, in order per chat, and
+that the engine stayed under the limits. It reports throughput and how
+long the interactive replies took. A second run lets
+the engine go faster than the fake allows, to check that it recovers
+through RetryAfter without losing or reordering anything.
+
+    python -m bench.delivery_bench [n_chats] [alerts]
+"""
+
+import asyncio
+import sys
+import time
+from collections import defaultdict, deque
+from telegram.error import RetryAfter
+from config import DELIVERY_CHAT_BURST, DELIVERY_CHAT_RATE, DELIVERY_INTERACTIVE_BURST, DELIVERY_RATE
+from core.delivery import ALERT, INTERACTIVE, DeliveryEngine, TokenBucket
+
+GLOBAL_LIMIT = 30
+CHAT_LIMIT   = TokenBucket(DELIVERY_CHAT_RATE, DELIVERY_INTERACTIVE_BURST).allowance()
+ALERT_LIMIT  = TokenBucket(DELIVERY_CHAT_RATE, DELIVERY_CHAT_BURST).allowance()
+LATENCY      = 0.05
+REPLY        = 9      # /search in instant mode: a header plus 8 cards
+
+
+class FakeBotAPI:
+    def __init__(self):
+        self.sent      = defaultdict(list)   # chat_id → texts in delivery order
+        self.rejected  = 0
+        self._global   = deque()             # send times in the last second
+        self._per_chat = defaultdict(deque)
+        self._alerts   = defaultdict(deque)
+
+    @staticmethod
+    def _window(times: deque, now: float) -> deque:
+        while times and times[0] <= now - 1:
+            times.popleft()
+        return times
+
+    async def send_message(self, chat_id: int, text: str, **kwargs):
+        now  = time.monotonic()
+        glob = self._window(self._global, now)
+        chat = self._window(self._per_chat[chat_id], now)
+        alerts = self._window(self._alerts[chat_id], now)
+        alert  = text.startswith("alert")
+        if len(glob) >= GLOBAL_LIMIT or len(chat) >= CHAT_LIMIT or alert and len(alerts) >= ALERT_LIMIT:
+            self.rejected += 1
+            await asyncio.sleep(LATENCY)
+            raise RetryAfter(1)
+        glob.append(now)
+        chat.append(now)
+        if alert:
+            alerts.append(now)
+        await asyncio.sleep(LATENCY)
+        self.sent[chat_id].append(text)
+        return text
+
+
+async def run(n_chats: int, alerts: int, rate: float):
+    api    = FakeBotAPI()
+    engine = DeliveryEngine(rate=rate)
+    engine.start(api)
+
+    start   = time.perf_counter()
+    pending = [engine.submit(chat_id, ALERT, text=f"alert {n}")
+               for n in range(alerts) for chat_id in range(n_chats)]
+    await asyncio.sleep(2)
+    waits = []
+    for chat_id in range(0, n_chats, max(1, n_chats // 5)):
+        t = time.perf_counter()
+        for n in range(REPLY):
+            await engine.send(chat_id, INTERACTIVE, text=f"search reply {n}")
+        waits.append(time.perf_counter() - t)
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - start
+    await engine.stop()
+
+    total = n_chats * alerts
+    for chat_id in range(n_chats):
+        alerts_seen = [t for t in api.sent[chat_id] if t.startswith("alert")]
+        assert alerts_seen == [f"alert {n}" for n in range(alerts)], (chat_id, alerts_seen)
+    print(f"rate {rate:>4.0f}/s: {total} alerts in {elapsed:6.1f}s ({total / elapsed:4.1f} msg/s), "
+          f"{api.rejected} rejected, {REPLY}-message search reply max {max(waits):.2f}s")
+    print(f"           {engine.stats.summary()}")
+    return api.rejected
+
+
+async def main(n_chats: int = 100, alerts: int = 5):
+    print(f"one-at-a-time sending would take ~{n_chats * alerts * LATENCY:.0f}s at {LATENCY * 1000:.0f}ms a call")
+    rejected = await run(n_chats, alerts, DELIVERY_RATE)
+    assert rejected == 0, "engine went over the fake API's limits"
+    await run(n_chats, alerts, GLOBAL_LIMIT * 1.5)
+    print("✅ all alerts delivered in order")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*args))
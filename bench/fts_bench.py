@@ -0,0 +1,111 @@
+"""
+bench/fts_bench.py — Old LIKE '%kw%' skill filter vs jobs_fts vs job_skills.
+
+Loads a synthetic corpus into a scratch DB through the real init_db() /
+save_jobs() path and checks every skill's result set against what the LIKE
+chain returned: the job_skills tags must match it exactly, and the FTS path
+(used for ranked search) may only drop keywords that occur solely inside a
+word ("ios" in "Bioscience"), which token-based matching does not see.
+Then times /search-shaped queries on all three.
+
+    python -m bench.fts_bench [n_jobs]
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+
+SCRATCH = os.path.join(tempfile.mkdtemp(), "fts_bench.db")
+os.environ["DB_PATH"] = SCRATCH
+
+from bench.classifier_bench import corpus   # noqa: E402
+from core.classifier import classify       # noqa: E402
+from db import database                    # noqa: E402
+from db.database import SKILL_KEYWORDS     # noqa: E402
+
+COLUMNS = "title, company, location, category, apply_link, source"
+
+
+def legacy_filter(skill: str):
+    """The LIKE chain search_jobs used before jobs_fts."""
+    keywords = SKILL_KEYWORDS.get(skill, [skill.lower()])
+    if skill == "Any" or not keywords:
+        return "1=1", []
+    parts, params = [], []
+    for kw in keywords:
+        parts += ["LOWER(title) LIKE ?", "LOWER(category) LIKE ?"]
+        params += [f"%{kw}%", f"%{kw}%"]
+    return "(" + " OR ".join(parts) + ")", params
+
+
+def mid_word_only(skill: str, title: str, category: str) -> bool:
+    """True when no keyword of `skill` starts at a word boundary of the row."""
+    text = f"{title} {category}".lower()
+    return not any(
+        re.search(r"(?<![a-z0-9])" + re.escape(kw.strip()), text)
+        for kw in SKILL_KEYWORDS.get(skill, [])
+    )
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+async def load(n: int):
+    await database.init_db()
+    jobs = [
+        {"id": str(i), "title": t, "company": "Acme", "location": "Remote",
+         "category": classify(t)[0], "skills": classify(t)[1],
+         "apply_link": f"https://x/{i}", "source": "Bench"}
+        for i, t in enumerate(corpus(n))
+    ]
+    for i in range(0, n, 5000):
+        await database.save_jobs(jobs[i:i + 5000], "2026-01-01 00:00:00")
+
+
+async def main(n: int = 50_000):
+    await load(n)
+    conn = sqlite3.connect(SCRATCH)
+    skills = [s for s in SKILL_KEYWORDS if s != "Any"]
+
+    for skill in skills:
+        like_sql, like_params = legacy_filter(skill)
+        want = {r[0]: r[1:] for r in conn.execute(
+            f"SELECT apply_link, title, category FROM jobs WHERE {like_sql}", like_params)}
+        tagged = {j["apply_link"] for j in await database.search_jobs(skill, "Any", limit=n)}
+        assert tagged == set(want), (skill, sorted(tagged ^ set(want))[:5])
+        fts = {j["apply_link"] for j in await database.search_jobs(skill, "Any", limit=n, ranked=True)}
+        extra = fts - set(want)
+        assert not extra, (skill, sorted(extra)[:5])
+        for link in set(want) - fts:
+            assert mid_word_only(skill, *want[link]), (skill, want[link])
+        missed = len(set(want) - fts)
+        print(f"✅ {skill:<13} {len(tagged):>6} jobs" + (f" (FTS drops {missed} mid-word hits)" if missed else ""))
+
+    print(f"\n{'/search (limit 8)':<28}{'LIKE':>10}{'FTS5':>10}{'tags':>10}")
+    for skill in ("Python", "Full Stack", "Backend", "iOS"):
+        like_sql, like_params = legacy_filter(skill)
+        old = _time(lambda: conn.execute(
+            f"SELECT {COLUMNS} FROM jobs WHERE {like_sql} AND LOWER(company) LIKE ? "
+            "ORDER BY rowid DESC LIMIT 8", like_params + ["%nobody%"]).fetchall(), 20)
+        times = []
+        for ranked in (True, False):
+            source, params, _ = database._skill_source(skill, ranked)
+            times.append(_time(lambda: conn.execute(
+                f"SELECT {COLUMNS} FROM {source} WHERE closed = 0 AND LOWER(company) LIKE ? "
+                "ORDER BY jobs.rowid DESC LIMIT 8", params + ["%nobody%"]).fetchall(), 20))
+        print(f"{skill + ', no company hit':<28}{old * 1e3:>8.1f}ms{times[0] * 1e3:>8.1f}ms{times[1] * 1e3:>8.1f}ms")
+
+    conn.close()
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
@@ -0,0 +1,144 @@
+"""
+bench/json_bench.py — Peak RSS and parse time: r.json() vs the jsonfast paths.
+
+Each (payload, mode) pair runs in a fresh subprocess so peak RSS is not
+polluted by earlier runs.
+
+    python -m bench.json_bench --record            # save live Greenhouse/Lever payloads
+    python -m bench.json_bench [kind:path ...]     # e.g. lever:bench/payloads/lever_netflix.json
+
+With no payloads given, it uses recorded files in bench/payloads/ if any,
+otherwise synthetic Greenhouse- and Lever-shaped payloads (~25 MB each).
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+CHUNK       = 64 * 1024
+MODES = ("r.json", "fast loads", "stream+project")
+
+
+def _peak_rss_kb() -> int:
+    # VmHWM is per address space; ru_maxrss survives fork/exec from the parent
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _fetcher(kind: str):
+    from core.fetchers.greenhouse_fetcher import GreenhouseFetcher
+    from core.fetchers.lever_fetcher import LeverFetcher
+    return {"greenhouse": GreenhouseFetcher, "lever": LeverFetcher}[kind](board="bench")
+
+
+def _chunks(path: str):
+    # What the fetcher sees from aiter_bytes(): the body a piece at a time, never whole
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            yield chunk
+
+
+def run_one(kind: str, path: str, mode: str):
+    from core.jsonfast import ItemScanner, loads
+    fetcher = _fetcher(kind)
+    if mode == "stream+project":
+        r = None
+    else:
+        r = httpx.Response(200, content=Path(path).read_bytes())
+        r.read()
+    base_kb = _peak_rss_kb()
+
+    start = time.perf_counter()
+    if mode == "r.json":
+        items = fetcher.items(r.json())
+    elif mode == "fast loads":
+        items = fetcher.items(loads(r.content))
+    else:
+        scanner, items = ItemScanner(fetcher.items_key, fetcher.fields), []
+        for chunk in _chunks(path):
+            items.extend(scanner.feed(chunk))
+        scanner.close()
+    jobs = [j for j in map(fetcher.normalize, items) if j]
+    secs = time.perf_counter() - start
+
+    peak_kb = _peak_rss_kb()
+    print(json.dumps({"secs": secs, "rss_mb": (peak_kb - base_kb) / 1024, "jobs": len(jobs)}))
+
+
+def record():
+    from config import GREENHOUSE_COMPANIES, LEVER_COMPANIES
+    PAYLOAD_DIR.mkdir(exist_ok=True)
+    urls = [("greenhouse", s, f"https://boards-api.greenhouse.io/v1/boards/{s}/jobs?content=true")
+            for s in GREENHOUSE_COMPANIES]
+    urls += [("lever", s, f"https://api.lever.co/v0/postings/{s}?mode=json") for s in LEVER_COMPANIES]
+    with httpx.Client(timeout=60, follow_redirects=True) as client:
+        for kind, slug, url in urls:
+            r = client.get(url)
+            if r.status_code == 200:
+                (PAYLOAD_DIR / f"{kind}_{slug}.json").write_bytes(r.content)
+                print(f"saved {kind}_{slug}.json ({len(r.content) / 1e6:.1f} MB)")
+
+
+def synthetic() -> list:
+    PAYLOAD_DIR.mkdir(exist_ok=True)
+    # Real boards are UTF-8 with accents and emoji; keep them raw, as the APIs send them
+    blurb = "We are looking for an engineer to build reliable systems in Zürich & São Paulo 🚀. " * 50
+    gh = {"jobs": [{
+        "id": i, "title": f"Senior Software Engineer {i} — Plateforme", "absolute_url": f"https://x/{i}",
+        "location": {"name": "München"}, "content": blurb, "updated_at": "2026-01-01",
+        "metadata": [{"id": k, "name": "Team", "value": "Infra"} for k in range(5)],
+        "departments": [{"id": 1, "name": "Engineering", "child_ids": [], "parent_id": None}],
+    } for i in range(6000)], "meta": {"total": 6000}}
+    lv = [{
+        "id": f"lv{i}", "text": f"Backend Developer {i}", "hostedUrl": f"https://x/{i}",
+        "categories": {"location": "NYC", "team": "Core", "commitment": "Full-time"},
+        "description": blurb, "descriptionPlain": blurb,
+        "lists": [{"text": "Requirements", "content": blurb[:800]}] * 3, "additional": blurb[:1200],
+    } for i in range(3000)]
+    paths = []
+    for kind, data in (("greenhouse", gh), ("lever", lv)):
+        path = PAYLOAD_DIR / f"synthetic_{kind}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        paths.append((kind, str(path)))
+    return paths
+
+
+def main(args: list):
+    if args[:1] == ["--record"]:
+        return record()
+    if args[:1] == ["--one"]:
+        return run_one(*args[1:4])
+
+    payloads = [tuple(a.split(":", 1)) for a in args]
+    if not payloads and PAYLOAD_DIR.exists():
+        payloads = [(p.name.split("_", 1)[0], str(p)) for p in sorted(PAYLOAD_DIR.glob("*.json"))
+                    if not p.name.startswith("synthetic_")]
+    if not payloads:
+        payloads = synthetic()
+
+    print(f"{'payload':<32}{'MB':>6}  {'mode':<16}{'parse':>9}{'peak RSS':>11}")
+    for kind, path in payloads:
+        size = os.path.getsize(path) / 1e6
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "bench.json_bench", "--one", kind, path, mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            res = json.loads(out.strip().splitlines()[-1])
+            print(f"{Path(path).name:<32}{size:>6.1f}  {mode:<16}{res['secs']:>8.3f}s{res['rss_mb']:>9.1f}MB")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
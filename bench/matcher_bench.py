@@ -0,0 +1,101 @@
+"""
+bench/matcher_bench.py — Per-user alert queries vs the inverted fan-out plan.
+
+Loads a synthetic corpus into a scratch DB through the real init_db() /
+save_jobs() path, subscribes n_users with random skills, companies and
+watermarks, and checks that plan_fanout() picks exactly the jobs the old
+one-query-per-user loop (per_user_jobs) did. Then times both.
+
+    python -m bench.matcher_bench [n_users] [n_jobs]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SCRATCH = os.path.join(tempfile.mkdtemp(), "matcher_bench.db")
+os.environ["DB_PATH"] = SCRATCH
+
+from bench.classifier_bench import corpus   # noqa: E402
+from config import COMPANIES, SKILLS        # noqa: E402
+from core.fetchers.base import make_job     # noqa: E402
+from core.matcher import plan_fanout        # noqa: E402
+from db import database                     # noqa: E402
+from db.connection import db_manager        # noqa: E402
+
+
+async def per_user_jobs(chat_id: int, skill: str, company: str, limit: int = database.NOTIFY_BATCH):
+    """The query the matcher used to run for every user: oldest matches past the watermark."""
+    async with db_manager.read() as db:
+        source, skill_params, _ = database._skill_source(skill)
+        company_sql, company_params = database._company_filter(company)
+        rows = await db.execute_fetchall(f"""
+            SELECT id FROM {source}
+            WHERE seq > (SELECT watermark FROM users WHERE chat_id=?)
+              AND closed = 0
+              AND NOT EXISTS (SELECT 1 FROM notified n WHERE n.chat_id=? AND n.job_id=jobs.id)
+              AND {company_sql}
+            ORDER BY seq
+            LIMIT ?
+        """, skill_params + [chat_id, chat_id] + company_params + [limit])
+    return [r[0] for r in rows]
+
+
+async def load(n_users: int, n_jobs: int):
+    await database.init_db()
+    names = [c for c in COMPANIES if c != "Any"] + ["Acme", "Globex"]
+    jobs  = [make_job(str(i), t, random.choice(names), "Remote", f"https://x/{i}", "Bench")
+             for i, t in enumerate(corpus(n_jobs))]
+    seen_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")   # inside the alert lookback
+    for i in range(0, n_jobs, 5000):
+        await database.save_jobs(jobs[i:i + 5000], seen_at)
+
+    top   = await database.current_seq()
+    users = [(chat_id, random.choice(SKILLS), random.choice(list(COMPANIES)),
+              random.randint(max(0, top - n_jobs // 10), top))
+             for chat_id in range(n_users)]
+
+    async def op(db):
+        await db.executemany(
+            "INSERT INTO users(chat_id, skill, company, watermark) VALUES(?,?,?,?)", users
+        )
+
+    await db_manager.submit("bench_users", op)
+    return users
+
+
+async def main(n_users: int = 5_000, n_jobs: int = 20_000):
+    random.seed(0)
+    users = await load(n_users, n_jobs)
+
+    start = time.perf_counter()
+    plan  = await plan_fanout()
+    inverted = time.perf_counter() - start
+    got = {}
+    for jobs in plan.deliveries.values():
+        for job, chat_ids in jobs:
+            for chat_id in chat_ids:
+                got.setdefault(chat_id, []).append(job["id"])
+
+    start = time.perf_counter()
+    want  = {}
+    for chat_id, skill, company, _ in users:
+        jobs = await per_user_jobs(chat_id, skill, company)
+        if jobs:
+            want[chat_id] = jobs
+    per_user = time.perf_counter() - start
+
+    assert got == want, [c for c in set(got) | set(want) if got.get(c) != want.get(c)][:5]
+    print(f"✅ {len(got)} users get {plan.messages} alerts from {len(plan.deliveries)} subscriptions")
+    print(f"per-user queries {per_user * 1e3:8.1f}ms")
+    print(f"fan-out plan     {inverted * 1e3:8.1f}ms")
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*args))
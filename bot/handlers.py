@@ -2,30 +2,40 @@
 bot/handlers.py — Skill + Company flow (location removed)
 """
 
+import re
 from telegram import Update
+from telegram.helpers import escape_markdown
 from telegram.ext import ContextTypes, ConversationHandler
-from db.database import save_user, get_user, search_jobs, get_stats
+from config import ALERT_MODE, SEARCH_MAX_DAYS
+from core.delivery import DELIVERY
+from core.digest import PARSE_MODE, esc, job_card, pack_digest, preview_options
+from db.database import save_user, get_user, search_jobs, get_stats, set_alert_mode
 from bot.keyboards import skill_keyboard, company_keyboard
 
 PICK_SKILL, PICK_COMPANY = range(2)
 
-SOURCE_BADGE = {
-    "Greenhouse": "🌿",
-    "Lever":      "🎯",
-    "Remotive":   "🌐",
-    "The Muse":   "💡",
-}
-
-
 # ─────────────────────────────────────────────────────
 # HELPER — fetch and send jobs to user
 # ─────────────────────────────────────────────────────
-async def send_jobs(chat_id: int, skill: str, company: str, ctx: ContextTypes.DEFAULT_TYPE):
-    jobs = await search_jobs(skill=skill, company=company, limit=8)
+def parse_window(args) -> int:
+    """'/search 24h' / '/search 3d' → hours (0 = no window), at most SEARCH_MAX_DAYS."""
+    m = re.fullmatch(r"(\d+)\s*([hd]?)", " ".join(args or []).strip().lower())
+    if not m:
+        return 0
+    longest = SEARCH_MAX_DAYS * 24
+    digits  = m.group(1).lstrip("0") or "0"
+    if len(digits) > len(str(longest)):
+        return longest     # also keeps int() off absurdly long digit strings
+    return min(int(digits) * (24 if m.group(2) == "d" else 1), longest)
+
+
+async def send_jobs(chat_id: int, skill: str, company: str, since_hours: int = 0,
+                    mode: str = ALERT_MODE):
+    jobs = await search_jobs(skill=skill, company=company, limit=8, since_hours=since_hours)
 
     if not jobs:
-        await ctx.bot.send_message(
-            chat_id=chat_id,
+        await DELIVERY.send(
+            chat_id,
             text=(
                 "😕 No matching jobs found right now.\n\n"
                 "I'll automatically alert you the moment new ones are posted!\n"
@@ -34,27 +44,22 @@ async def send_jobs(chat_id: int, skill: str, company: str, ctx: ContextTypes.DE
         )
         return
 
-    company_label = f" at *{company}*" if company != "Any" else ""
-    await ctx.bot.send_message(
-        chat_id=chat_id,
-        text=f"✅ Found *{len(jobs)}* *{skill}* jobs{company_label}:",
-        parse_mode="Markdown"
-    )
+    company_label = f" at *{esc(company)}*" if company != "Any" else ""
+    window_label  = f" posted in the last {since_hours}h" if since_hours else ""
+    header = f"✅ Found *{len(jobs)}* *{esc(skill)}* jobs{company_label}{window_label}:"
+
+    if mode == "digest":
+        for text, packed in pack_digest(header, jobs):
+            await DELIVERY.send(chat_id, text=text, parse_mode=PARSE_MODE, **preview_options(packed))
+        return
 
+    await DELIVERY.send(chat_id, text=header, parse_mode=PARSE_MODE)
     for job in jobs:
-        badge = SOURCE_BADGE.get(job["source"], "📋")
-        msg = (
-            f"{badge} *{job['company']}*\n"
-            f"💼 {job['title']}\n"
-            f"📍 {job['location']}\n"
-            f"🏷️ {job['category']}  •  _{job['source']}_\n\n"
-            f"[👉 Apply Here]({job['apply_link']})"
-        )
         try:
-            await ctx.bot.send_message(
-                chat_id=chat_id,
-                text=msg,
-                parse_mode="Markdown",
+            await DELIVERY.send(
+                chat_id,
+                text=job_card(job),
+                parse_mode=PARSE_MODE,
                 disable_web_page_preview=False
             )
         except Exception as e:
@@ -139,7 +144,8 @@ async def on_company_chosen(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         parse_mode="Markdown"
     )
 
-    await send_jobs(chat_id, skill, company, ctx)
+    user = await get_user(chat_id)
+    await send_jobs(chat_id, skill, company, mode=user["mode"])
     return ConversationHandler.END
 
 
@@ -152,11 +158,15 @@ async def search(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Use /start first to set your preferences.")
         return
 
-    await update.message.reply_text(
-        f"🔍 Searching *{user['skill']}* jobs at *{user['company']}*...",
+    since_hours = parse_window(ctx.args)
+    # Through the engine like the results, so it counts against the chat's pacing
+    await DELIVERY.send(
+        update.effective_chat.id,
+        text=f"🔍 Searching *{user['skill']}* jobs at *{user['company']}*"
+        + (f" from the last {since_hours}h" if since_hours else "") + "...",
         parse_mode="Markdown"
     )
-    await send_jobs(update.effective_chat.id, user["skill"], user["company"], ctx)
+    await send_jobs(update.effective_chat.id, user["skill"], user["company"], since_hours, user["mode"])
 
 
 # ─────────────────────────────────────────────────────
@@ -170,9 +180,43 @@ async def profile(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         f"👤 *Your Profile*\n\n"
         f"💼 Skill: *{user['skill']}*\n"
-        f"🏢 Company: *{user['company']}*\n\n"
+        f"🏢 Company: *{user['company']}*\n"
+        f"🔔 Alerts: *{user['mode']}*\n\n"
         f"/search — find jobs now\n"
-        f"/update — change preferences",
+        f"/update — change preferences\n"
+        f"/mode — instant or digest alerts",
+        parse_mode="Markdown"
+    )
+
+
+# ─────────────────────────────────────────────────────
+# /mode
+# ─────────────────────────────────────────────────────
+ALERT_MODES = {
+    "instant": "one message per job",
+    "digest":  "new jobs packed into a single message",
+}
+
+
+async def mode_cmd(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    user = await get_user(update.effective_chat.id)
+    if not user:
+        await update.message.reply_text("Use /start first to set your preferences.")
+        return
+
+    choice = (ctx.args or [""])[0].lower()
+    if choice not in ALERT_MODES:
+        await update.message.reply_text(
+            f"🔔 Alerts: *{user['mode']}* ({ALERT_MODES.get(user['mode'], '')})\n\n"
+            "/mode instant — one message per job\n"
+            "/mode digest — all new jobs in one message",
+            parse_mode="Markdown"
+        )
+        return
+
+    await set_alert_mode(update.effective_chat.id, choice)
+    await update.message.reply_text(
+        f"✅ Alerts set to *{choice}*: {ALERT_MODES[choice]}.",
         parse_mode="Markdown"
     )
 
@@ -180,13 +224,24 @@ async def profile(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
 # ─────────────────────────────────────────────────────
 # /stats
 # ─────────────────────────────────────────────────────
+def _breakdown(title: str, rows) -> str:
+    if not rows:
+        return ""
+    lines = "\n".join(f"  {escape_markdown(str(key))}: {n}" for key, n in rows)
+    return f"\n{title}\n{lines}\n"
+
+
 async def stats(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    job_count, user_count = await get_stats()
+    s = await get_stats()
     await update.message.reply_text(
         f"📊 *Bot Stats*\n\n"
-        f"📋 Jobs in DB: *{job_count}*\n"
-        f"👥 Registered Users: *{user_count}*\n\n"
-        f"_Refreshes every hour automatically._",
+        f"📋 Jobs in DB: *{s['jobs']}* ({s['open']} open)\n"
+        f"👥 Registered Users: *{s['users']}*\n"
+        + _breakdown("📅 *New jobs per day*", s["days"])
+        + _breakdown("🌐 *Top sources*", s["sources"])
+        + _breakdown("🏷 *Top categories*", s["categories"])
+        + _breakdown("🏢 *Top companies*", s["companies"])
+        + "\n_Refreshes every hour automatically._",
         parse_mode="Markdown"
     )
 
@@ -199,8 +254,10 @@ async def help_cmd(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
         "📖 *Commands*\n\n"
         "/start — Register & set preferences\n"
         "/search — Find matching jobs now\n"
+        "/search 24h — Only jobs posted in the last 24 hours (or 3d, ...)\n"
         "/profile — View your profile\n"
         "/update — Change skill or company\n"
+        "/mode — Instant or digest alerts\n"
         "/stats — DB stats\n"
         "/help — This message",
         parse_mode="Markdown"
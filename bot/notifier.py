@@ -1,7 +1,6 @@
 from telegram import Bot
 from config import TELEGRAM_TOKEN
-# from db.database import get_all_users
-from db.database import get_all_users, get_unnotified_jobs, mark_notified
+from db.database import get_all_users
 
 bot = Bot(token=TELEGRAM_TOKEN)
 
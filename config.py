@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from data.workday_companies import WORKDAY_COMPANIES
 
 load_dotenv()
 
@@ -8,6 +9,90 @@ DB_PATH = os.getenv("DB_PATH", "jobs.db")
 DB_NAME = DB_PATH
 FETCH_INTERVAL_MINUTES = int(os.getenv("FETCH_INTERVAL_MINUTES", 60))
 
+# ── SQLite tuning ─────────────────────────────────────────────────────────────
+DB_READERS    = int(os.getenv("DB_READERS", 4))          # pooled read connections
+DB_CACHE_KB   = int(os.getenv("DB_CACHE_KB", 16384))     # page cache per connection
+DB_MMAP_BYTES = int(os.getenv("DB_MMAP_BYTES", 128 * 1024 * 1024))
+DB_WRITE_GROUP = int(os.getenv("DB_WRITE_GROUP", 64))    # queued writes committed together
+
+# ── Collector concurrency ─────────────────────────────────────────────────────
+# Max sources fetched at once, and max at once against a single API host
+FETCH_CONCURRENCY          = int(os.getenv("FETCH_CONCURRENCY", 16))
+FETCH_PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", 4))
+
+# ── Incremental crawling of "most recent first" sources ───────────────────────
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", 20))    # safety cap during bursts
+CRAWL_STATE_IDS = int(os.getenv("CRAWL_STATE_IDS", 500))   # newest ids kept per source
+
+# ── Search ────────────────────────────────────────────────────────────────────
+SEARCH_BM25       = os.getenv("SEARCH_BM25", "0") == "1"   # /search by relevance instead of newest first
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 256))  # cached (skill, company) results, 0 = off
+SEARCH_MAX_DAYS   = int(os.getenv("SEARCH_MAX_DAYS", 365))    # longest /search 24h / 3d window
+
+# ── Job lifecycle / retention ─────────────────────────────────────────────────
+# Closed postings leave `jobs` for `jobs_archive` after JOB_ARCHIVE_GRACE_HOURS;
+# jobs not seen for JOB_MAX_AGE_DAYS count as closed (non-snapshot sources).
+# Delivered-alert rows are only a dedup log behind the per-user watermark.
+JOB_ARCHIVE_GRACE_HOURS  = int(os.getenv("JOB_ARCHIVE_GRACE_HOURS", 24))
+JOB_MAX_AGE_DAYS         = int(os.getenv("JOB_MAX_AGE_DAYS", 45))
+RETENTION_INTERVAL_HOURS = int(os.getenv("RETENTION_INTERVAL_HOURS", 24))
+NOTIFIED_RETENTION_DAYS  = int(os.getenv("NOTIFIED_RETENTION_DAYS", 7))   # alert dedup log
+
+# ── JSON decoding ─────────────────────────────────────────────────────────────
+# Streamed bodies at least this big are scanned element by element as they arrive
+# (see core/jsonfast); smaller ones are buffered and decoded in one go
+JSON_STREAM_THRESHOLD = int(os.getenv("JSON_STREAM_THRESHOLD", 1024 * 1024))
+
+# ── Workday tenants ───────────────────────────────────────────────────────────
+WORKDAY_TENANT_CONCURRENCY = int(os.getenv("WORKDAY_TENANT_CONCURRENCY", 4))
+WORKDAY_MAX_JOBS           = int(os.getenv("WORKDAY_MAX_JOBS", 2000))   # safety cap per tenant
+
+# ── Streaming ingest ──────────────────────────────────────────────────────────
+# Fetchers block once INGEST_QUEUE_PAGES pages are waiting (backpressure); the
+# writer commits every INGEST_BATCH_SIZE jobs or INGEST_FLUSH_SECS, whichever first
+INGEST_QUEUE_PAGES = int(os.getenv("INGEST_QUEUE_PAGES", 32))
+INGEST_BATCH_SIZE  = int(os.getenv("INGEST_BATCH_SIZE", 500))
+INGEST_FLUSH_SECS  = float(os.getenv("INGEST_FLUSH_SECS", 2))
+
+# ── Shared HTTP client pool ───────────────────────────────────────────────────
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 32))
+HTTP_MAX_KEEPALIVE   = int(os.getenv("HTTP_MAX_KEEPALIVE", 16))
+HTTP_KEEPALIVE_SECS  = float(os.getenv("HTTP_KEEPALIVE_SECS", 90))
+HTTP2_ENABLED        = os.getenv("HTTP2_ENABLED", "0") == "1"   # needs `pip install h2`
+
+# ── Resilience: timeouts, retries, circuit breaker ────────────────────────────
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT    = float(os.getenv("HTTP_READ_TIMEOUT", 20))     # default; fetchers may override
+HTTP_RETRIES         = int(os.getenv("HTTP_RETRIES", 3))             # on 429/5xx and connect errors
+HTTP_BACKOFF_BASE    = float(os.getenv("HTTP_BACKOFF_BASE", 1))      # seconds, doubled per attempt
+HTTP_MAX_BACKOFF     = float(os.getenv("HTTP_MAX_BACKOFF", 30))      # longer Retry-After → give up
+BREAKER_THRESHOLD    = int(os.getenv("BREAKER_THRESHOLD", 3))        # consecutive failed ticks
+BREAKER_COOLDOWN_MIN = int(os.getenv("BREAKER_COOLDOWN_MIN", 120))
+
+# ── Telegram delivery ─────────────────────────────────────────────────────────
+# Telegram allows ~30 messages/s per bot and ~1/s per chat; stay under both.
+# A chat's bucket lets through at most BURST + RATE - 1 messages in any one
+# second. Alerts keep a burst of 1, so they never go over the per-chat limit;
+# a /search reply (header plus cards) may start with a short burst, which
+# Telegram tolerates, and every message still counts against both buckets.
+# Workers only overlap request latency.
+DELIVERY_WORKERS    = int(os.getenv("DELIVERY_WORKERS", 16))
+DELIVERY_RATE       = float(os.getenv("DELIVERY_RATE", 28))        # messages/s, all chats
+DELIVERY_CHAT_RATE  = float(os.getenv("DELIVERY_CHAT_RATE", 1))    # messages/s, per chat
+DELIVERY_CHAT_BURST = int(os.getenv("DELIVERY_CHAT_BURST", 1))     # back to back before pacing (alerts)
+DELIVERY_INTERACTIVE_BURST = int(os.getenv("DELIVERY_INTERACTIVE_BURST", 3))   # ...for a /search reply
+DELIVERY_RETRIES    = int(os.getenv("DELIVERY_RETRIES", 3))        # network errors; RetryAfter is always honoured
+
+# ── Alert format ──────────────────────────────────────────────────────────────
+# "digest" packs a user's matched jobs into one message, "instant" sends one
+# message per job; users pick with /mode, this is the default for new users
+# (users from before /mode existed were migrated to "instant")
+ALERT_MODE          = os.getenv("ALERT_MODE", "digest")
+DIGEST_LINK_PREVIEW = os.getenv("DIGEST_LINK_PREVIEW", "0") == "1"   # small preview of the first job's link
+# A user who fell behind (long outage, failing chat) resumes from jobs first
+# seen this recently instead of everything since their watermark
+ALERT_LOOKBACK_HOURS = int(os.getenv("ALERT_LOOKBACK_HOURS", 72))
+
 # ── Skills ────────────────────────────────────────────────────────────────────
 SKILLS = [
     "Python", "Java", "JavaScript", "React", "Node.js",
@@ -60,6 +145,21 @@ LEVER_COMPANIES = [
     "plaid", "robinhood",
 ]
 
+# ── Sources crawled every tick ────────────────────────────────────────────────
+# Each entry is {"kind": <registered fetcher>, **options}; see core/fetchers
+SOURCES = (
+    [{"kind": "greenhouse", "board": slug} for slug in GREENHOUSE_COMPANIES]
+    + [{"kind": "lever", "board": slug} for slug in LEVER_COMPANIES]
+    + [
+        {"kind": "remotive"},
+        {"kind": "remoteok"},
+        {"kind": "themuse", "max_pages": 3},
+        {"kind": "amazon",  "max_pages": 5},
+        {"kind": "google",  "max_pages": 5},
+    ]
+    + [{"kind": "workday", "company": c, "url": url} for c, url in WORKDAY_COMPANIES.items()]
+)
+
 # ── Company name aliases for DB matching ──────────────────────────────────────
 # Maps display name → keywords to search in company column in DB
 COMPANY_ALIASES = {
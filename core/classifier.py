@@ -0,0 +1,107 @@
+"""
+core/classifier.py — Single-pass job classifier.
+
+Every category keyword and every SKILL_KEYWORDS keyword is compiled once
+into one trie-shaped regex. A single scan over the lowercased title yields
+all matched keywords, from which we pick the primary category (same
+priority order the old chained `any(k in t ...)` checks used) and the full
+set of skill tags (same substring semantics as the SQL LIKE filter, which
+also looks at the category).
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from db.database import SKILL_KEYWORDS
+
+# Priority order matters: first category with any keyword in the title wins
+CATEGORY_RULES: List[Tuple[str, List[str]]] = [
+    ("React",        ["react", "next.js", "nextjs"]),
+    ("Node.js",      ["node", "express.js"]),
+    ("JavaScript",   ["javascript", "typescript"]),
+    ("Python",       ["python"]),
+    ("Java",         ["java ", "java,", "spring boot", "kotlin"]),
+    ("ML/AI",        ["machine learning", "deep learning", "nlp", "llm", "ai engineer"]),
+    ("Data Science", ["data scientist", "data science", "data analyst"]),
+    ("DevOps",       ["devops", "site reliability", "sre", "kubernetes", "docker", "platform engineer"]),
+    ("Android",      ["android", "kotlin developer"]),
+    ("iOS",          ["ios", "swift developer"]),
+    ("Testing/QA",   ["qa engineer", "quality assurance", "test engineer", "sdet"]),
+    ("UI/UX",        ["ui/ux", "ux designer", "product designer"]),
+    ("Full Stack",   ["full stack", "fullstack", "full-stack"]),
+    ("Frontend",     ["frontend", "front-end"]),
+    ("Backend",      ["backend", "back-end"]),
+]
+DEFAULT_CATEGORY = "Software Engineering"
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex matching the longest of `words` at a position, shaped like a trie."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class JobClassifier:
+    def __init__(self, categories=CATEGORY_RULES, skills: Dict[str, List[str]] = SKILL_KEYWORDS):
+        self.skill_order = [s for s, kws in skills.items() if kws]
+        kw_rank:   Dict[str, int]      = {}
+        kw_skills: Dict[str, set]      = {}
+        for rank, (_, kws) in enumerate(categories):
+            for kw in kws:
+                kw_rank.setdefault(kw, rank)
+        for skill, kws in skills.items():
+            for kw in kws:
+                kw_skills.setdefault(kw, set()).add(skill)
+
+        keywords = set(kw_rank) | set(kw_skills)
+        # Overlapping lookahead: one hit per start position (the longest keyword
+        # there); every other keyword starting at that position is its prefix.
+        self._pattern = re.compile("(?=(" + _trie_regex(keywords) + "))")
+        self._expand: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        for kw in keywords:
+            prefixes = [p for p in keywords if kw.startswith(p)]
+            ranks    = [kw_rank[p] for p in prefixes if p in kw_rank]
+            tags     = frozenset(s for p in prefixes for s in kw_skills.get(p, ()))
+            self._expand[kw] = (min(ranks) if ranks else len(categories), tags)
+
+        self._categories = [name for name, _ in categories] + [DEFAULT_CATEGORY]
+        # The SQL filter also matched keywords against the category column
+        self._category_tags = {
+            name: self._scan(name.lower())[1] for name in self._categories
+        }
+
+    def _scan(self, text: str) -> Tuple[int, FrozenSet[str]]:
+        rank, tags = len(self._categories) - 1, frozenset()
+        for kw in set(self._pattern.findall(text)):
+            kw_rank, kw_tags = self._expand[kw]
+            if kw_rank < rank:
+                rank = kw_rank
+            tags |= kw_tags
+        return rank, tags
+
+    def classify(self, title: str) -> Tuple[str, Tuple[str, ...]]:
+        """(primary category, matched skill tags in SKILL_KEYWORDS order)"""
+        rank, tags = self._scan(title.lower())
+        category = self._categories[rank]
+        tags |= self._category_tags[category]
+        return category, tuple(s for s in self.skill_order if s in tags)
+
+    def categorize(self, title: str) -> str:
+        return self._categories[self._scan(title.lower())[0]]
+
+
+CLASSIFIER = JobClassifier()
+classify   = CLASSIFIER.classify
+categorize = CLASSIFIER.categorize
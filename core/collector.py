@@ -1,310 +1,247 @@
 """
-core/collector.py
-Fetches jobs from 6 sources:
-  1. Greenhouse  — startup/mid companies (free public API)
-  2. Lever       — startup/mid companies (free public API)
-  3. Remotive    — remote jobs aggregator (free)
-  4. The Muse    — general job board (free)
-  5. Amazon      — amazon.jobs public JSON search API
-  6. Google      — careers.google.com public JSON API
+core/collector.py — Generic driver over the fetcher registry (core/fetchers).
+
+Sources (see config.SOURCES): Greenhouse and Lever boards, Remotive,
+RemoteOK, The Muse, Amazon, Google and Workday MNC tenants.
+
+Each fetcher is an async generator yielding normalized jobs page by page.
+All sources run concurrently (capped globally and per API host) and feed a
+bounded queue; a single writer stage drains it in size/time-bounded batches,
+so memory stays flat and jobs are saved while slower sources are still
+fetching.
+
+Full-snapshot sources (Greenhouse, Lever) also drive the job lifecycle:
+after a clean fetch the writer closes that board's jobs that were not seen
+this tick, and a conditional-GET hit just refreshes their last_seen.
+
+A source whose jobs fail to save is neither swept nor does it keep this
+tick's validators and crawl marks (nor the company keys its jobs taught),
+so next tick fetches it again in full instead of skipping the lost
+postings as unchanged or already known.
 """
 
-import hashlib
-import httpx
-from typing import List
-from config import GREENHOUSE_COMPANIES, LEVER_COMPANIES
-from db.database import save_job
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept": "application/json",
-}
-
-
-def make_id(*parts) -> str:
-    return hashlib.md5("_".join(str(p) for p in parts).encode()).hexdigest()
-
-
-def categorize(title: str) -> str:
-    t = title.lower()
-    if any(k in t for k in ["react", "next.js", "nextjs"]):             return "React"
-    if any(k in t for k in ["node", "express.js"]):                      return "Node.js"
-    if any(k in t for k in ["javascript", "typescript"]):                return "JavaScript"
-    if "python" in t:                                                     return "Python"
-    if any(k in t for k in ["java ", "java,", "spring boot", "kotlin"]): return "Java"
-    if any(k in t for k in ["machine learning", "deep learning", "nlp", "llm", "ai engineer"]): return "ML/AI"
-    if any(k in t for k in ["data scientist", "data science", "data analyst"]): return "Data Science"
-    if any(k in t for k in ["devops", "site reliability", "sre", "kubernetes", "docker", "platform engineer"]): return "DevOps"
-    if any(k in t for k in ["android", "kotlin developer"]):             return "Android"
-    if any(k in t for k in ["ios", "swift developer"]):                  return "iOS"
-    if any(k in t for k in ["qa engineer", "quality assurance", "test engineer", "sdet"]): return "Testing/QA"
-    if any(k in t for k in ["ui/ux", "ux designer", "product designer"]): return "UI/UX"
-    if any(k in t for k in ["full stack", "fullstack", "full-stack"]):   return "Full Stack"
-    if any(k in t for k in ["frontend", "front-end"]):                   return "Frontend"
-    if any(k in t for k in ["backend", "back-end"]):                     return "Backend"
-    return "Software Engineering"
-
-
-# ── 1. GREENHOUSE ─────────────────────────────────────────────────────────────
-async def fetch_greenhouse(company: str) -> List[dict]:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
-    jobs = []
-    try:
-        async with httpx.AsyncClient(timeout=15, headers=HEADERS) as client:
-            r = await client.get(url)
-            if r.status_code != 200:
-                print(f"  [Greenhouse:{company}] HTTP {r.status_code}")
-                return []
-            for item in r.json().get("jobs", []):
-                title = item.get("title", "").strip()
-                link  = item.get("absolute_url", "").strip()
-                if not title or not link:
-                    continue
-                jobs.append({
-                    "id":         make_id("gh", company, item["id"]),
-                    "title":      title,
-                    "company":    company.replace("-", " ").title(),
-                    "location":   item.get("location", {}).get("name", "Remote"),
-                    "category":   categorize(title),
-                    "apply_link": link,
-                    "source":     "Greenhouse",
-                })
-        print(f"  [Greenhouse:{company}] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [Greenhouse:{company}] ❌ {e}")
-    return jobs
-
-
-# ── 2. LEVER ──────────────────────────────────────────────────────────────────
-async def fetch_lever(company: str) -> List[dict]:
-    url = f"https://api.lever.co/v0/postings/{company}?mode=json"
-    jobs = []
-    try:
-        async with httpx.AsyncClient(timeout=15, headers=HEADERS) as client:
-            r = await client.get(url)
-            if r.status_code != 200:
-                print(f"  [Lever:{company}] HTTP {r.status_code}")
-                return []
-            data = r.json()
-            if not isinstance(data, list):
-                return []
-            for item in data:
-                title = item.get("text", "").strip()
-                link  = item.get("hostedUrl", "").strip()
-                if not title or not link:
-                    continue
-                location = item.get("categories", {}).get("location", "") or "Remote"
-                jobs.append({
-                    "id":         make_id("lv", company, item.get("id", "")),
-                    "title":      title,
-                    "company":    company.replace("-", " ").title(),
-                    "location":   location,
-                    "category":   categorize(title),
-                    "apply_link": link,
-                    "source":     "Lever",
-                })
-        print(f"  [Lever:{company}] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [Lever:{company}] ❌ {e}")
-    return jobs
-
-
-# ── 3. REMOTIVE ───────────────────────────────────────────────────────────────
-async def fetch_remotive() -> List[dict]:
-    jobs = []
-    try:
-        async with httpx.AsyncClient(timeout=20, headers=HEADERS) as client:
-            r = await client.get("https://remotive.com/api/remote-jobs?limit=100")
-            if r.status_code != 200:
-                return []
-            for item in r.json().get("jobs", []):
-                title = item.get("title", "").strip()
-                link  = item.get("url", "").strip()
-                if not title or not link:
-                    continue
-                jobs.append({
-                    "id":         make_id("rm", item.get("id", "")),
-                    "title":      title,
-                    "company":    item.get("company_name", "Unknown"),
-                    "location":   "Remote",
-                    "category":   categorize(title),
-                    "apply_link": link,
-                    "source":     "Remotive",
-                })
-        print(f"  [Remotive] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [Remotive] ❌ {e}")
-    return jobs
-
-
-# ── 4. THE MUSE ───────────────────────────────────────────────────────────────
-async def fetch_themuse(pages: int = 3) -> List[dict]:
-    jobs = []
-    try:
-        async with httpx.AsyncClient(timeout=20, headers=HEADERS) as client:
-            for page in range(1, pages + 1):
-                r = await client.get(
-                    f"https://www.themuse.com/api/public/jobs?page={page}&descending=true"
-                )
-                if r.status_code != 200:
-                    break
-                for item in r.json().get("results", []):
-                    title = item.get("name", "").strip()
-                    link  = item.get("refs", {}).get("landing_page", "").strip()
-                    if not title or not link:
-                        continue
-                    locs     = item.get("locations", [])
-                    location = locs[0].get("name", "Remote") if locs else "Remote"
-                    jobs.append({
-                        "id":         make_id("tm", item.get("id", "")),
-                        "title":      title,
-                        "company":    item.get("company", {}).get("name", "Unknown"),
-                        "location":   location,
-                        "category":   categorize(title),
-                        "apply_link": link,
-                        "source":     "The Muse",
-                    })
-        print(f"  [TheMuse] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [TheMuse] ❌ {e}")
-    return jobs
-
-
-# ── 5. AMAZON (amazon.jobs public JSON API) ───────────────────────────────────
-async def fetch_amazon(pages: int = 5) -> List[dict]:
-    """
-    Amazon has a public undocumented JSON API used by their own website.
-    Returns up to pages*10 jobs.
-    """
-    jobs = []
-    base = "https://www.amazon.jobs/en/search.json"
-    params_base = {
-        "result_limit": 10,
-        "sort":         "recent",
-        "category[]":   "software-development",
-        "facets[]":     ["category", "location", "business_category"],
-    }
-    try:
-        async with httpx.AsyncClient(timeout=20, headers={
-            **HEADERS,
-            "Referer": "https://www.amazon.jobs/en/search",
-        }) as client:
-            for page in range(pages):
-                params = {**params_base, "offset": page * 10}
-                r = await client.get(base, params=params)
-                if r.status_code != 200:
-                    print(f"  [Amazon] Page {page} HTTP {r.status_code}")
-                    break
-                data = r.json()
-                results = data.get("jobs", [])
-                if not results:
-                    break
-                for item in results:
-                    title = item.get("title", "").strip()
-                    job_id = item.get("id_icims", item.get("job_id", ""))
-                    link  = f"https://www.amazon.jobs/en/jobs/{job_id}" if job_id else ""
-                    if not title or not link:
-                        continue
-                    loc_list = item.get("normalized_location", "")
-                    location = loc_list if isinstance(loc_list, str) else "Remote"
-                    jobs.append({
-                        "id":         make_id("amz", job_id),
-                        "title":      title,
-                        "company":    "Amazon",
-                        "location":   location or "USA",
-                        "category":   categorize(title),
-                        "apply_link": link,
-                        "source":     "Amazon",
-                    })
-        print(f"  [Amazon] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [Amazon] ❌ {e}")
-    return jobs
-
-
-# ── 6. GOOGLE (careers.google.com JSON API) ───────────────────────────────────
-async def fetch_google(pages: int = 5) -> List[dict]:
-    """
-    Google's careers page loads jobs via a public JSON endpoint.
-    """
-    jobs = []
-    base = "https://careers.google.com/api/v3/search/"
-    try:
-        async with httpx.AsyncClient(timeout=20, headers={
-            **HEADERS,
-            "Referer": "https://careers.google.com/",
-        }) as client:
-            for page in range(pages):
-                params = {
-                    "page":     page + 1,
-                    "pageSize": 20,
-                    "sort_by":  "date",
-                }
-                r = await client.get(base, params=params)
-                if r.status_code != 200:
-                    print(f"  [Google] Page {page+1} HTTP {r.status_code}")
-                    break
-                data = r.json()
-                results = data.get("jobs", [])
-                if not results:
-                    break
-                for item in results:
-                    title = item.get("title", "").strip()
-                    job_id = item.get("job_id", "")
-                    link  = f"https://careers.google.com/jobs/results/{job_id}/" if job_id else ""
-                    if not title or not link:
-                        continue
-                    locs     = item.get("locations", [])
-                    location = locs[0].get("display", "USA") if locs else "USA"
-                    jobs.append({
-                        "id":         make_id("goog", job_id),
-                        "title":      title,
-                        "company":    "Google",
-                        "location":   location,
-                        "category":   categorize(title),
-                        "apply_link": link,
-                        "source":     "Google",
-                    })
-        print(f"  [Google] ✅ {len(jobs)} jobs")
-    except Exception as e:
-        print(f"  [Google] ❌ {e}")
-    return jobs
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from config import (
+    FETCH_CONCURRENCY, FETCH_PER_HOST_CONCURRENCY,
+    INGEST_QUEUE_PAGES, INGEST_BATCH_SIZE, INGEST_FLUSH_SECS,
+)
+from core.companies import COMPANY_KEYS
+from core.crawl_state import CRAWL_STATE
+from core.fetchers import Fetcher, build_fetchers
+from core.http_pool import HttpPool
+from core.resilience import BREAKERS
+from db.connection import db_manager
+from db.database import close_missing_jobs, save_jobs, touch_board
+from db.search_cache import SEARCH_CACHE
+
+
+# ── CONCURRENCY ───────────────────────────────────────────────────────────────
+class _SourceHttp:
+    """The shared pool as one source sees it: at most `concurrency` requests in flight."""
+
+    LIMITED = {"request", "get", "get_if_changed", "post"}
+
+    def __init__(self, http: HttpPool, concurrency: int):
+        self._http = http
+        self._sem  = asyncio.Semaphore(max(1, concurrency))
+
+    def __getattr__(self, name):
+        attr = getattr(self._http, name)
+        if name not in self.LIMITED:
+            return attr
+
+        async def limited(*args, **kwargs):
+            async with self._sem:
+                return await attr(*args, **kwargs)
+        return limited
+
+
+class _Limiter:
+    """Global cap on in-flight sources, a per-host cap, and each source's own request budget."""
+
+    def __init__(self, total: int, per_host: int):
+        self._total    = asyncio.Semaphore(max(1, total))
+        self._per_host = max(1, per_host)
+        self._hosts    = {}
+
+    @asynccontextmanager
+    async def slot(self, fetcher: Fetcher, http: HttpPool):
+        """Run `fetcher` here, with the pool it must use: capped at fetcher.concurrency."""
+        host = fetcher.host
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self._per_host)
+        # Take the host slot first so a busy host never holds global slots
+        async with self._hosts[host]:
+            async with self._total:
+                yield _SourceHttp(http, fetcher.concurrency)
+
+
+# ── INGEST PIPELINE ───────────────────────────────────────────────────────────
+_DONE = object()
+
+
+class _Snapshot:
+    """Queued after a snapshot board's last page: sweep that board once it is written."""
+
+    def __init__(self, board: str, unchanged: bool):
+        self.board     = board
+        self.unchanged = unchanged
+
+
+class IngestStats:
+    def __init__(self):
+        self.started     = time.perf_counter()
+        self.seen_at     = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        self.fetched     = 0
+        self.new_ids     = set()
+        self.batches     = 0
+        self.max_depth   = 0
+        self.first_saved = None   # seconds into the tick of the first commit
+        self.closed      = 0
+        self.failed      = set()   # sources with jobs in a batch that did not save
+        self.lost_names  = set()   # ...and those jobs' raw company names
+
+
+async def _produce(limiter: _Limiter, fetcher: Fetcher, http: HttpPool,
+                   queue: asyncio.Queue, stats: IngestStats, timings: dict):
+    if not BREAKERS.allow(fetcher.name):
+        return
+    async with limiter.slot(fetcher, http) as source_http:
+        start = time.perf_counter()
+        async for page in fetcher.pages(source_http):
+            if not page:
+                continue
+            for job in page:
+                job["board"] = fetcher.name
+            await queue.put(page)   # blocks when the writer falls behind
+            stats.fetched  += len(page)
+            stats.max_depth = max(stats.max_depth, queue.qsize())
+        timings[fetcher.name] = time.perf_counter() - start
+    if fetcher.snapshot and fetcher.error is None:
+        await queue.put(_Snapshot(fetcher.name, fetcher.unchanged))
+    BREAKERS.record(fetcher.name, ok=fetcher.error is None)
+
+
+async def _write(queue: asyncio.Queue, stats: IngestStats):
+    """Drain pages into batches flushed at INGEST_BATCH_SIZE jobs or INGEST_FLUSH_SECS."""
+    loop  = asyncio.get_running_loop()
+    batch = []
+    deadline = None
+
+    async def flush():
+        nonlocal batch, deadline
+        if batch:
+            try:
+                stats.new_ids |= await save_jobs(batch, stats.seen_at)
+                stats.batches += 1
+                if stats.first_saved is None:
+                    stats.first_saved = time.perf_counter() - stats.started
+            except Exception as e:
+                # Keep draining — a dead writer would deadlock producers on a full queue
+                stats.failed     |= {job["board"] for job in batch}
+                stats.lost_names |= {job["company"] for job in batch}
+                print(f"  [Ingest] ❌ batch of {len(batch)} failed: {e}")
+        batch, deadline = [], None
+
+    while True:
+        timeout = None if deadline is None else max(0.0, deadline - loop.time())
+        try:
+            page = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            await flush()
+            continue
+        if page is _DONE:
+            await flush()
+            return
+        if isinstance(page, _Snapshot):
+            await flush()   # the board's pages must be written before it is swept
+            if page.board in stats.failed:
+                continue
+            try:
+                if page.unchanged:
+                    await touch_board(page.board, stats.seen_at)
+                else:
+                    stats.closed += await close_missing_jobs(page.board, stats.seen_at)
+            except Exception as e:
+                print(f"  [Ingest] ❌ sweep of {page.board} failed: {e}")
+            continue
+        batch.extend(j for j in page if j.get("title") and j.get("apply_link"))
+        if deadline is None:
+            deadline = loop.time() + INGEST_FLUSH_SECS
+        if len(batch) >= INGEST_BATCH_SIZE:
+            await flush()
 
 
 # ── MASTER COLLECTOR ──────────────────────────────────────────────────────────
-async def collect_all_jobs() -> int:
+async def collect_all_jobs(http: HttpPool) -> int:
     print("\n" + "="*50)
     print("🔍 COLLECTING JOBS FROM ALL PLATFORMS")
     print("="*50)
 
-    all_jobs = []
-
-    print("\n📦 Greenhouse:")
-    for company in GREENHOUSE_COMPANIES:
-        all_jobs.extend(await fetch_greenhouse(company))
-
-    print("\n📦 Lever:")
-    for company in LEVER_COMPANIES:
-        all_jobs.extend(await fetch_lever(company))
-
-    print("\n📦 Remotive:")
-    all_jobs.extend(await fetch_remotive())
+    await http.cache.load()
+    await CRAWL_STATE.load()
+    await COMPANY_KEYS.load()
+    await BREAKERS.load()
+    http.cache.reset_counters()
+    http.retries = 0
+    db_manager.stats.reset()
 
-    print("\n📦 The Muse:")
-    all_jobs.extend(await fetch_themuse(pages=3))
+    limiter = _Limiter(FETCH_CONCURRENCY, FETCH_PER_HOST_CONCURRENCY)
+    queue   = asyncio.Queue(maxsize=INGEST_QUEUE_PAGES)
+    stats   = IngestStats()
+    timings = {}
 
-    print("\n📦 Amazon:")
-    all_jobs.extend(await fetch_amazon(pages=5))
-
-    print("\n📦 Google:")
-    all_jobs.extend(await fetch_google(pages=5))
-
-    new_count = 0
-    for job in all_jobs:
-        if job.get("title") and job.get("apply_link"):
-            if await save_job(job):
-                new_count += 1
-
-    print(f"\n✅ Done: {new_count} new jobs added ({len(all_jobs)} total fetched)")
+    writer = asyncio.create_task(_write(queue, stats))
+    try:
+        await asyncio.gather(*(
+            _produce(limiter, fetcher, http, queue, stats, timings)
+            for fetcher in build_fetchers()
+        ))
+    finally:
+        await queue.put(_DONE)
+        await writer
+    for source in stats.failed:
+        http.cache.discard(source)
+        CRAWL_STATE.discard(source)
+    COMPANY_KEYS.discard(stats.lost_names)
+    await http.cache.flush()
+    await CRAWL_STATE.flush()
+    await COMPANY_KEYS.flush()
+    await BREAKERS.flush()
+    wall = time.perf_counter() - stats.started
+
+    print(f"\n⏱️  Tick took {wall:.1f}s (sum of sources {sum(timings.values()):.1f}s):")
+    for label, secs in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {label:<28} {secs:6.2f}s")
+    first = f"{stats.first_saved:.1f}s" if stats.first_saved is not None else "—"
+    print(
+        f"📥 Ingest: {stats.batches} batches, first save at {first}, "
+        f"peak queue depth {stats.max_depth}/{INGEST_QUEUE_PAGES}"
+    )
+
+    skipped = BREAKERS.open_sources()
+    if skipped:
+        print(f"🔌 Circuit open: {', '.join(skipped)}")
+    if http.retries:
+        print(f"🔁 {http.retries} HTTP retries")
+    if stats.failed:
+        print(f"⚠️  Jobs not saved, refetching next tick: {', '.join(sorted(stats.failed))}")
+    if stats.closed:
+        print(f"🚪 {stats.closed} postings closed (gone from their board)")
+    if SEARCH_CACHE.hits or SEARCH_CACHE.misses:
+        print(
+            f"🔎 Search cache: {SEARCH_CACHE.hits} hit / {SEARCH_CACHE.misses} miss "
+            f"({SEARCH_CACHE.hit_rate():.0%}), generation {SEARCH_CACHE.generation}"
+        )
+    print(f"💾 DB writes: {db_manager.stats.summary()}")
+
+    new_count = len(stats.new_ids)
+    print(
+        f"\n✅ Done: {new_count} new jobs added ({stats.fetched} total fetched) — "
+        f"cache {http.cache.hits} hit / {http.cache.misses} miss"
+    )
     print("="*50 + "\n")
-    return new_count
\ No newline at end of file
+    return new_count
@@ -0,0 +1,75 @@
+"""
+core/companies.py — Resolve raw company names to a canonical company key.
+
+Boards store "Hcltech", aggregators "HCL Technologies Ltd", Workday
+"Accenture"... At ingest every name is normalized (core/fingerprint) and
+resolved to a key, stored in the indexed jobs.company_key column, so a
+company filter is an equality lookup instead of LIKE '%alias%'.
+
+Resolution order:
+  1. company_map — learned name → key pairs, plus manual ones (manual=1)
+  2. COMPANY_ALIASES / COMPANIES slugs, matched on leading whole words
+     ("meta platforms" → Meta, but "metabase" stays "metabase")
+  3. the normalized name itself
+
+Names resolved by rule 2 are learned into company_map; like the crawl
+state, new entries are staged during the tick and persisted by flush(),
+and discard() drops those learned from jobs that failed to save.
+"""
+
+from typing import Dict
+from config import COMPANIES, COMPANY_ALIASES
+from core.fingerprint import normalize_company
+from db.database import load_company_map, save_company_map
+
+
+def _alias_index() -> Dict[str, str]:
+    index = {}
+    for key, aliases in COMPANY_ALIASES.items():
+        for alias in aliases + [key, COMPANIES.get(key, "")]:
+            name = normalize_company(alias)
+            if name and key != "Any":
+                index.setdefault(name, key)
+    return index
+
+
+class CompanyKeys:
+    def __init__(self):
+        self._aliases = _alias_index()
+        self._longest = max((len(a.split()) for a in self._aliases), default=0)
+        self._learned = {}    # normalized name → key
+        self._staged  = {}
+
+    async def load(self):
+        self._learned = await load_company_map()
+
+    def _match_alias(self, name: str):
+        words = name.split()
+        for n in range(min(len(words), self._longest), 0, -1):
+            key = self._aliases.get(" ".join(words[:n]))
+            if key:
+                return key
+        return None
+
+    def resolve(self, company: str) -> str:
+        name = normalize_company(company)
+        if name in self._learned:
+            return self._learned[name]
+        key = self._match_alias(name)
+        if key is None:
+            return name
+        self._learned[name] = self._staged[name] = key
+        return key
+
+    def discard(self, companies):
+        """Unstage what resolving these raw names learned (their jobs were not saved)."""
+        for name in map(normalize_company, companies):
+            if self._staged.pop(name, None) is not None:
+                del self._learned[name]
+
+    async def flush(self):
+        staged, self._staged = self._staged, {}
+        await save_company_map(staged)
+
+
+COMPANY_KEYS = CompanyKeys()
@@ -0,0 +1,57 @@
+"""
+core/crawl_state.py — High-water marks for paginated, newest-first sources.
+
+For each source we remember the newest job ids seen. Once a source has
+marks, a crawl stops after the first page holding any known id, so a quiet
+tick costs one request; it keeps going past the default page count only
+while pages are entirely new (up to CRAWL_MAX_PAGES).
+Like the HTTP validators, updates are staged during the tick and only
+persisted by flush() once the jobs are saved; discard() drops a source's
+staged marks when its jobs could not be saved.
+"""
+
+from typing import List, Set
+from config import CRAWL_STATE_IDS
+from db.database import load_crawl_state, save_crawl_state
+
+
+class CrawlState:
+    def __init__(self, keep: int = CRAWL_STATE_IDS):
+        self.keep    = keep
+        self._recent = {}    # source → [ids], newest first
+        self._staged = {}
+        self._before = {}    # source → ids before this tick's record()
+        self._loaded = False
+
+    async def load(self):
+        if not self._loaded:
+            self._recent = await load_crawl_state()
+            self._loaded = True
+
+    def known(self, source: str) -> Set[str]:
+        return set(self._recent.get(source, ()))
+
+    def record(self, source: str, ids: List[str]):
+        """ids in crawl order (newest first) from this tick's pages."""
+        fresh  = list(dict.fromkeys(ids))
+        seen   = set(fresh)
+        self._before.setdefault(source, self._recent.get(source))
+        merged = fresh + [i for i in self._recent.get(source, ()) if i not in seen]
+        self._recent[source] = self._staged[source] = merged[:self.keep]
+
+    def discard(self, source: str):
+        if source not in self._before:
+            return
+        before = self._before.pop(source)
+        self._staged.pop(source, None)
+        if before is None:
+            self._recent.pop(source, None)
+        else:
+            self._recent[source] = before
+
+    async def flush(self):
+        staged, self._staged, self._before = self._staged, {}, {}
+        await save_crawl_state(staged)
+
+
+CRAWL_STATE = CrawlState()
@@ -0,0 +1,301 @@
+"""
+core/delivery.py — Rate-limited Telegram delivery engine.
+
+Every outgoing message goes through one queue served by a pool of workers:
+
+  • a global token bucket keeps the bot under Telegram's ~30 msg/s,
+  • each chat has its own buckets (~1 msg/s, with a short burst only for
+    INTERACTIVE messages) and its messages go out one at a time, in the
+    order they were queued,
+  • lanes: a chat with a queued INTERACTIVE message (a /search reply) is
+    served before any chat that only has ALERT messages,
+  • RetryAfter (flood control) pauses the chat and the global bucket for
+    the time Telegram asks and requeues the message; network errors are
+    retried with backoff, other errors fail the message's future.
+
+Anything with an async send_message(chat_id=..., **kwargs) can be the bot,
+which is how bench/delivery_bench.py runs it against a fake Bot API.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+from telegram.error import BadRequest, NetworkError, RetryAfter
+from config import (
+    DELIVERY_CHAT_BURST, DELIVERY_CHAT_RATE, DELIVERY_INTERACTIVE_BURST, DELIVERY_RATE,
+    DELIVERY_RETRIES, DELIVERY_WORKERS,
+)
+from core.resilience import backoff_delay
+
+INTERACTIVE, ALERT = 0, 1    # lanes, lower is served first
+LANES = (INTERACTIVE, ALERT)
+
+
+class TokenBucket:
+    """
+    `burst` tokens, refilled at `rate` per second. Any one-second window
+    holds at most allowance() takes: the burst plus what refills meanwhile.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate   = rate
+        self.burst  = max(1.0, burst)
+        self.tokens = self.burst
+        self.stamp  = time.monotonic()   # refill resumes from here (later than now while held)
+
+    def _refill(self, now: float):
+        if now > self.stamp:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp  = now
+
+    def allowance(self) -> int:
+        return int(self.burst) + math.ceil(self.rate) - 1
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return max(0.0, self.stamp - now) + (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def hold(self, seconds: float):
+        """Hand out nothing for `seconds` (Telegram's retry_after)."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0
+        self.stamp  = max(self.stamp, now + seconds)
+
+    async def acquire(self):
+        while (wait := self.delay(time.monotonic())) > 0:
+            await asyncio.sleep(wait)
+        self.take(time.monotonic())
+
+
+@dataclass
+class Outgoing:
+    chat_id:  int
+    lane:     int
+    kwargs:   dict
+    future:   asyncio.Future
+    attempts: int   = 0
+    queued:   float = field(default_factory=time.monotonic)
+
+
+class _Chat:
+    def __init__(self, chat_id: int):
+        self.chat_id   = chat_id
+        # A message waits on its lane's bucket but is charged to both, so
+        # alerts alone stay at the chat rate and a /search reply can burst
+        self.pacers    = {
+            INTERACTIVE: TokenBucket(DELIVERY_CHAT_RATE, DELIVERY_INTERACTIVE_BURST),
+            ALERT:       TokenBucket(DELIVERY_CHAT_RATE, DELIVERY_CHAT_BURST),
+        }
+        self.queues    = {lane: deque() for lane in LANES}
+        self.busy      = False     # a worker is sending for this chat
+        self.scheduled = None      # lane of its live heap entry
+        self.version   = 0         # heap entries with an older version are stale
+
+    def lane(self) -> Optional[int]:
+        return next((lane for lane in LANES if self.queues[lane]), None)
+
+    def pop(self) -> Outgoing:
+        return self.queues[self.lane()].popleft()
+
+    def delay(self, lane: int, now: float) -> float:
+        return self.pacers[lane].delay(now)
+
+    def take(self, now: float):
+        for pacer in self.pacers.values():
+            pacer.take(now)
+
+    def hold(self, seconds: float):
+        for pacer in self.pacers.values():
+            pacer.hold(seconds)
+
+    def rested(self, now: float) -> bool:
+        """Every bucket full again: the chat is no different from a fresh one."""
+        return all(p.delay(now) == 0 and p.tokens >= p.burst for p in self.pacers.values())
+
+
+class DeliveryStats:
+    def __init__(self):
+        self.sent        = 0
+        self.failed      = 0
+        self.retries     = 0    # network errors retried
+        self.flood_waits = 0    # RetryAfter responses
+        self.peak_queued = 0
+        self.latency_max = {lane: 0.0 for lane in LANES}   # queued → sent, seconds
+
+    def summary(self) -> str:
+        return (
+            f"{self.sent} sent, {self.failed} failed, {self.retries} retried, "
+            f"{self.flood_waits} flood waits, peak queue {self.peak_queued}, "
+            f"max wait {self.latency_max[INTERACTIVE]:.1f}s interactive / "
+            f"{self.latency_max[ALERT]:.1f}s alerts"
+        )
+
+
+class DeliveryEngine:
+    def __init__(self, workers: int = DELIVERY_WORKERS, rate: float = DELIVERY_RATE,
+                 retries: int = DELIVERY_RETRIES):
+        self.n_workers = workers
+        self.bucket    = TokenBucket(rate, 1)      # evenly spaced: never over `rate` in any second
+        self.retries   = retries
+        self.stats     = DeliveryStats()
+        self.queued    = 0
+        self._bot      = None
+        self._workers  = []
+        self._chats    = {}
+        self._prune_at = 1024
+        self._heaps    = {lane: [] for lane in LANES}   # (ready_at, n, version, chat)
+        self._counter  = itertools.count()
+        self._wakeup   = asyncio.Event()
+
+    def start(self, bot):
+        if self._workers:
+            return
+        self._bot     = bot
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.n_workers)]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for chat in self._chats.values():
+            for queue in chat.queues.values():
+                for msg in queue:
+                    msg.future.cancel()
+        self._chats.clear()
+        self._heaps = {lane: [] for lane in LANES}
+        self.queued = 0
+
+    def submit(self, chat_id: int, lane: int = ALERT, **kwargs) -> asyncio.Future:
+        """Queue a send_message(chat_id, **kwargs); the future resolves to its result."""
+        if not self._workers:
+            raise RuntimeError("delivery engine not started")
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            if len(self._chats) >= self._prune_at:
+                self._prune()
+            chat = self._chats[chat_id] = _Chat(chat_id)
+        msg = Outgoing(chat_id, lane, kwargs, asyncio.get_running_loop().create_future())
+        chat.queues[lane].append(msg)
+        self.queued += 1
+        self.stats.peak_queued = max(self.stats.peak_queued, self.queued)
+        self._schedule(chat)
+        return msg.future
+
+    async def send(self, chat_id: int, lane: int = INTERACTIVE, **kwargs):
+        return await self.submit(chat_id, lane, **kwargs)
+
+    def _prune(self):
+        """Forget idle chats whose pacers have refilled; a fresh one is the same."""
+        now = time.monotonic()
+        for chat_id, chat in list(self._chats.items()):
+            if not chat.busy and chat.lane() is None and chat.rested(now):
+                del self._chats[chat_id]
+        self._prune_at = max(1024, 2 * len(self._chats))
+
+    # ── scheduling ───────────────────────────────────────────────────────────
+    def _schedule(self, chat: _Chat):
+        lane = chat.lane()
+        if lane is None:
+            return
+        if chat.busy or chat.scheduled is not None and chat.scheduled <= lane:
+            return
+        now = time.monotonic()
+        chat.version  += 1
+        chat.scheduled = lane
+        entry = (now + chat.delay(lane, now), next(self._counter), chat.version, chat)
+        heapq.heappush(self._heaps[lane], entry)
+        self._wakeup.set()
+
+    async def _next_chat(self) -> _Chat:
+        while True:
+            now, wait = time.monotonic(), None
+            for lane in LANES:
+                heap = self._heaps[lane]
+                while heap:
+                    ready_at, _, version, chat = heap[0]
+                    if version != chat.version:
+                        heapq.heappop(heap)
+                        continue
+                    if ready_at <= now:
+                        heapq.heappop(heap)
+                        chat.scheduled = None
+                        return chat
+                    wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                    break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self):
+        while True:
+            chat = await self._next_chat()
+            chat.busy = True
+            try:
+                msg = chat.pop()
+                await self.bucket.acquire()
+                # Take the chat's tokens only now, right before the request goes
+                # out, so its spacing is the spacing Telegram sees
+                chat.take(time.monotonic())
+                await self._send(chat, msg)
+            finally:
+                chat.busy = False
+                self._schedule(chat)
+
+    async def _send(self, chat: _Chat, msg: Outgoing):
+        try:
+            result = await self._bot.send_message(chat_id=msg.chat_id, **msg.kwargs)
+        except RetryAfter as e:
+            wait = e.retry_after
+            wait = wait.total_seconds() if hasattr(wait, "total_seconds") else float(wait)
+            self.stats.flood_waits += 1
+            print(f"[Delivery] ⏳ Flood control: waiting {wait:.0f}s")
+            self.bucket.hold(wait)
+            chat.hold(wait)
+            chat.queues[msg.lane].appendleft(msg)
+            return
+        except BadRequest as e:      # a NetworkError subclass, but retrying won't help
+            self._fail(msg, e)
+            return
+        except NetworkError as e:
+            msg.attempts += 1
+            if msg.attempts <= self.retries:
+                self.stats.retries += 1
+                chat.hold(backoff_delay(msg.attempts))
+                chat.queues[msg.lane].appendleft(msg)
+                return
+            self._fail(msg, e)
+            return
+        except Exception as e:
+            self._fail(msg, e)
+            return
+        self.queued -= 1
+        self.stats.sent += 1
+        latency = time.monotonic() - msg.queued
+        self.stats.latency_max[msg.lane] = max(self.stats.latency_max[msg.lane], latency)
+        if not msg.future.done():
+            msg.future.set_result(result)
+
+    def _fail(self, msg: Outgoing, error: Exception):
+        self.queued -= 1
+        self.stats.failed += 1
+        if not msg.future.done():
+            msg.future.set_exception(error)
+
+
+DELIVERY = DeliveryEngine()
@@ -0,0 +1,128 @@
+"""
+core/digest.py — Render jobs as Telegram MarkdownV2 messages.
+
+Instant mode sends one card per job; digest mode packs a user's jobs into
+as few messages as fit under Telegram's 4096-character limit, which is
+normally one. MarkdownV2 rather than the legacy Markdown the other replies
+use, because only V2 can escape inside bold/italic, so a company like
+"C++_Labs" or a title like "*Urgent* Dev (m/f)" can not break the message.
+Headers passed in must be MarkdownV2 already (build them with esc()).
+
+A job that would not fit a message on its own (very long fields, or an
+apply URL of thousands of characters) is shortened until it does: shorter
+fields first, then the link without its query string, then just the site.
+"""
+
+from typing import Callable, List, Tuple
+from urllib.parse import urlsplit
+from telegram import LinkPreviewOptions
+from telegram.helpers import escape_markdown
+from config import DIGEST_LINK_PREVIEW
+
+PARSE_MODE    = "MarkdownV2"
+MESSAGE_LIMIT = 4096
+FIELD_LIMIT   = 200     # longest title/company/location shown
+SHORT_FIELD   = 40      # ...when a job has to be squeezed into one message
+
+SOURCE_BADGE = {
+    "Greenhouse": "🌿",
+    "Lever":      "🎯",
+    "Remotive":   "🌐",
+    "The Muse":   "💡",
+}
+
+
+def esc(text, limit: int = FIELD_LIMIT) -> str:
+    text = str(text or "")
+    if len(text) > limit:
+        text = text[:limit - 1] + "…"
+    return escape_markdown(text, version=2)
+
+
+def link(url: str) -> str:
+    """A URL usable inside [..](..)."""
+    return escape_markdown(url or "", version=2, entity_type="text_link")
+
+
+def _details(job: dict, limit: int) -> str:
+    """'🏷️ Backend  •  _Greenhouse · Remotive_' for jobs that carry them (search results)."""
+    parts = []
+    if job.get("category"):
+        parts.append(f"🏷️ {esc(job['category'], limit)}")
+    if job.get("sources"):
+        parts.append(f"_{esc(' · '.join(job['sources']), limit)}_")
+    return "  •  ".join(parts)
+
+
+def _card(job: dict, heading: str, limit: int, url: str) -> str:
+    badge   = SOURCE_BADGE.get(job.get("source"), "📋")
+    details = _details(job, limit)
+    return (
+        (f"{heading}\n\n🏢 " if heading else f"{badge} ") + f"*{esc(job['company'], limit)}*\n"
+        f"💼 {esc(job['title'], limit)}\n"
+        f"📍 {esc(job['location'], limit)}\n"
+        + (f"{details}\n" if details else "")
+        + f"\n[👉 Apply Here]({link(url)})"
+    )
+
+
+def _entry(n: int, job: dict, limit: int, url: str) -> str:
+    details = _details(job, limit)
+    return (
+        f"*{n}\\. {esc(job['company'], limit)}* — {esc(job['title'], limit)}\n"
+        f"📍 {esc(job['location'], limit)}" + (f"  •  {details}" if details else "") + "\n"
+        f"[👉 Apply Here]({link(url)})"
+    )
+
+
+def _shorter_links(url: str) -> List[str]:
+    """url, then without query/fragment, then just scheme://host."""
+    parts = urlsplit(url or "")
+    return [url, f"{parts.scheme}://{parts.netloc}{parts.path}", f"{parts.scheme}://{parts.netloc}"]
+
+
+def _fit(render: Callable[[int, str], str], job: dict, room: int) -> str:
+    """render(field limit, url), shortened step by step until it is at most `room` long."""
+    full, trimmed, site = _shorter_links(job["apply_link"])
+    for limit, url in ((FIELD_LIMIT, full), (SHORT_FIELD, full), (SHORT_FIELD, trimmed), (SHORT_FIELD, site)):
+        text = render(limit, url)
+        if _length(text) <= room:
+            break
+    return text
+
+
+def job_card(job: dict, heading: str = "") -> str:
+    """One job as its own message (instant mode). `heading` is already Markdown."""
+    return _fit(lambda limit, url: _card(job, heading, limit, url), job, MESSAGE_LIMIT)
+
+
+def _length(text: str) -> int:
+    """Telegram counts the limit in UTF-16 code units (most emoji are 2)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def pack_digest(header: str, jobs: List[dict]) -> List[Tuple[str, List[dict]]]:
+    """
+    Jobs packed into as few messages as fit MESSAGE_LIMIT, in order, with
+    `header` (already Markdown) on the first. Returns (text, jobs in it)
+    pairs so a caller can account for each message separately.
+    """
+    messages, text, packed = [], header, []
+    room = MESSAGE_LIMIT - _length(header) - 2     # any entry fits even under the header
+    for n, job in enumerate(jobs, 1):
+        entry = _fit(lambda limit, url: _entry(n, job, limit, url), job, room)
+        if packed and _length(text) + 2 + _length(entry) > MESSAGE_LIMIT:
+            messages.append((text, packed))
+            text, packed = "", []
+        text = f"{text}\n\n{entry}" if text else entry
+        packed.append(job)
+    if packed:
+        messages.append((text, packed))
+    return messages
+
+
+def preview_options(jobs: List[dict]) -> dict:
+    """send_message kwargs for a digest: no previews, or a small one for the first job."""
+    if DIGEST_LINK_PREVIEW and jobs:
+        return {"link_preview_options": LinkPreviewOptions(url=jobs[0]["apply_link"], prefer_small_media=True)}
+    return {"link_preview_options": LinkPreviewOptions(is_disabled=True)}
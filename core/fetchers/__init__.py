@@ -0,0 +1,27 @@
+"""
+core/fetchers — Pluggable job sources.
+
+Each module registers its fetcher class under a kind; config.SOURCES lists
+the boards to crawl as {"kind": ..., **options}, so adding a board is a
+config change.
+"""
+
+from typing import List
+from config import SOURCES
+from core.fetchers.base import REGISTRY, Fetcher, make_id
+from core.fetchers import (  # noqa: F401  (imported for registration)
+    amazon_fetcher, google_fetcher, greenhouse_fetcher, lever_fetcher,
+    remote_fetcher, themuse_fetcher, workday_fetcher,
+)
+
+
+def build_fetchers(sources=SOURCES) -> List[Fetcher]:
+    fetchers = []
+    for spec in sources:
+        opts = dict(spec)
+        kind = opts.pop("kind")
+        if kind not in REGISTRY:
+            print(f"[Fetchers] Unknown source kind '{kind}' — skipped")
+            continue
+        fetchers.append(REGISTRY[kind](**opts))
+    return fetchers
@@ -0,0 +1,42 @@
+"""
+core/fetchers/amazon_fetcher.py — amazon.jobs public JSON search API.
+
+Amazon has a public undocumented JSON API used by their own website.
+"""
+
+from core.fetchers.base import OFFSET, JsonFetcher, make_id, make_job, register
+
+
+@register("amazon")
+class AmazonFetcher(JsonFetcher):
+    source      = "Amazon"
+    host        = "www.amazon.jobs"
+    pagination  = OFFSET
+    page_size   = 10
+    max_pages   = 5
+    incremental = True
+    profile     = "amazon"
+    items_key   = "jobs"
+    fields      = ("id_icims", "job_id", "title", "normalized_location", "posted_date")
+
+    def request(self, cursor):
+        return "https://www.amazon.jobs/en/search.json", {
+            "result_limit": self.page_size,
+            "sort":         "recent",
+            "category[]":   "software-development",
+            "facets[]":     ["category", "location", "business_category"],
+            "offset":       cursor,
+        }
+
+    def normalize(self, item):
+        title  = item.get("title", "").strip()
+        job_id = item.get("id_icims", item.get("job_id", ""))
+        link   = f"https://www.amazon.jobs/en/jobs/{job_id}" if job_id else ""
+        if not title or not link:
+            return None
+        loc_list = item.get("normalized_location", "")
+        location = loc_list if isinstance(loc_list, str) else "Remote"
+        return make_job(
+            make_id("amz", job_id), title, "Amazon", location or "USA", link, self.source,
+            item.get("posted_date"),
+        )
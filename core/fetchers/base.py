@@ -0,0 +1,223 @@
+"""
+core/fetchers/base.py — Fetcher protocol and the shared JSON fetcher.
+
+A fetcher declares where it lives (host), how it paginates, how many
+requests it may have in flight, and how to normalize one raw item. The
+collector drives every fetcher the same way, so they all get the same
+concurrency limits (including that per-source budget, enforced on the
+HTTP pool the fetcher is handed), conditional-GET caching and metrics.
+"""
+
+import hashlib
+import re
+import httpx
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Tuple
+from config import CRAWL_MAX_PAGES, JSON_STREAM_THRESHOLD
+from core.classifier import classify
+from core.companies import COMPANY_KEYS
+from core.crawl_state import CRAWL_STATE
+from core.fingerprint import fingerprint
+from core.http_pool import HttpPool
+from core.jsonfast import ItemReader, loads
+
+SINGLE = "single"   # one request returns the whole board
+PAGE   = "page"     # ?page=1,2,3...
+OFFSET = "offset"   # ?offset=0,N,2N...
+
+
+# kind (as used in config.SOURCES) → fetcher class
+REGISTRY: Dict[str, type] = {}
+
+
+def register(kind: str):
+    def decorator(cls):
+        REGISTRY[kind] = cls
+        return cls
+    return decorator
+
+
+def make_id(*parts) -> str:
+    return hashlib.md5("_".join(str(p) for p in parts).encode()).hexdigest()
+
+
+_DAYS_AGO = re.compile(r"(\d+)\+? days? ago")
+
+
+def parse_posted(value: Any) -> Optional[str]:
+    """
+    A source's posting date → UTC "YYYY-MM-DD HH:MM:SS" (jobs.posted_at).
+    Accepts epoch seconds/milliseconds, ISO 8601, "March 5, 2024" and
+    Workday's "Posted 3 Days Ago"; anything else → None.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(value / 1000 if value > 1e11 else value, timezone.utc)
+        else:
+            text = str(value).strip()
+            low  = text.lower()
+            if low.startswith("posted"):
+                days = 0 if "today" in low else 1 if "yesterday" in low else None
+                if days is None and (m := _DAYS_AGO.search(low)):
+                    days = int(m.group(1))
+                if days is None:
+                    return None
+                dt = datetime.now(timezone.utc) - timedelta(days=days)
+            elif text[:4].isdigit():
+                dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            else:
+                dt = datetime.strptime(text, "%B %d, %Y")
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def make_job(job_id: str, title: str, company: str, location: str, link: str, source: str,
+             posted: Any = None) -> dict:
+    category, skills = classify(title)
+    return {
+        "id":          job_id,
+        "title":       title,
+        "company":     company,
+        "company_key": COMPANY_KEYS.resolve(company),
+        "location":    location,
+        "category":    category,
+        "skills":      skills,   # → job_skills, not a jobs column
+        "apply_link":  link,
+        "source":      source,
+        "fingerprint": fingerprint(company, title, location, link),
+        "posted_at":   parse_posted(posted),
+    }
+
+
+class Fetcher(Protocol):
+    name:        str   # label used in logs/metrics, e.g. "Greenhouse:stripe"
+    source:      str   # value stored in jobs.source
+    host:        str   # API host, for per-host concurrency limits
+    pagination:  str   # SINGLE | PAGE | OFFSET
+    concurrency: int   # max requests this source may have in flight
+    snapshot:    bool  # every fetch returns the full open set, so absence means closed
+    error:       Optional[str]   # why the last run failed, None if it succeeded
+    unchanged:   bool  # last run got a conditional-GET hit (snapshot fetchers)
+
+    def normalize(self, item: dict) -> Optional[dict]: ...
+
+    def pages(self, http: HttpPool) -> AsyncIterator[List[dict]]: ...
+
+
+class JsonFetcher(ABC):
+    """
+    Generic JSON board walker. Subclasses set the class attributes and
+    implement request() and normalize(). `items_key` names the array of
+    postings in the payload (None for a top-level array) and `fields` the
+    keys normalize() reads; with `fields` set, bodies are streamed and
+    large ones scanned element by element as they arrive.
+    """
+    source      = ""
+    host        = ""
+    pagination  = SINGLE
+    page_size   = 0
+    max_pages   = 1
+    incremental = False   # newest-first feed: stop at the first page with a known id
+    concurrency = 1
+    snapshot    = False
+    error       = None
+    unchanged   = False
+    profile     = "default"
+    timeout     = 20
+    items_key: Optional[str] = None
+    fields:    Tuple[str, ...] = ()
+
+    def __init__(self, max_pages: Optional[int] = None):
+        if max_pages is not None:
+            self.max_pages = max_pages
+
+    @property
+    def name(self) -> str:
+        return self.source
+
+    def cursor(self, page: int) -> Optional[int]:
+        """Page index (0-based) → value the API expects for this pagination strategy."""
+        if self.pagination == PAGE:
+            return page + 1
+        if self.pagination == OFFSET:
+            return page * self.page_size
+        return None
+
+    @abstractmethod
+    def request(self, cursor: Optional[int]) -> Tuple[str, Optional[dict]]:
+        """(url, query params) for one page."""
+
+    def items(self, data) -> list:
+        if self.items_key is None:
+            return data if isinstance(data, list) else []
+        return data.get(self.items_key, []) if isinstance(data, dict) else []
+
+    @abstractmethod
+    def normalize(self, item: dict) -> Optional[dict]:
+        """One raw posting → make_job() dict, or None to skip it."""
+
+    async def fetch(self, http: HttpPool, cursor: Optional[int],
+                    reader: Optional[ItemReader] = None) -> Optional[httpx.Response]:
+        """One request; None when the body is unchanged since last tick."""
+        url, params = self.request(cursor)
+        return await http.get_if_changed(
+            url, params=params, profile=self.profile, owner=self.name, timeout=self.timeout,
+            consume=reader and reader.feed,
+        )
+
+    def reader(self) -> Optional[ItemReader]:
+        """Where a streamed body goes; None reads it whole (no `fields` to project to)."""
+        if not self.fields:
+            return None
+        return ItemReader(self.items_key, self.fields, JSON_STREAM_THRESHOLD, self.items)
+
+    async def pages(self, http: HttpPool) -> AsyncIterator[List[dict]]:
+        total, fetched, seen = 0, 0, []
+        known = CRAWL_STATE.known(self.name) if self.incremental else set()
+        # Cold start walks the default page count; afterwards bursts may go further
+        limit = CRAWL_MAX_PAGES if known else self.max_pages
+        self.error, self.unchanged = None, False
+        try:
+            for page in range(limit):
+                reader = self.reader()
+                r = await self.fetch(http, self.cursor(page), reader)
+                fetched += 1
+                if r is None:
+                    if self.pagination == SINGLE:
+                        print(f"  [{self.name}] ⏸️  unchanged")
+                        self.unchanged = True
+                        return
+                    if known:
+                        break   # unchanged newest-first page → nothing new behind it
+                    continue
+                if r.status_code != 200:
+                    print(f"  [{self.name}] Page {page + 1} HTTP {r.status_code}")
+                    self.error = f"HTTP {r.status_code}"
+                    break
+                raw = reader.close() if reader else self.items(loads(r.content))
+                if not raw:
+                    break
+                jobs = [job for job in map(self.normalize, raw) if job]
+                if self.incremental:
+                    seen.extend(job["id"] for job in jobs)
+                    fresh = sum(job["id"] not in known for job in jobs)
+                    if not fresh:
+                        break   # caught up with the high-water mark
+                total += len(jobs)
+                yield jobs
+                if known and fresh < len(jobs):
+                    break       # reached the high-water mark: nothing new behind it
+            if self.error is None:
+                print(f"  [{self.name}] ✅ {total} jobs ({fetched} requests)")
+        except Exception as e:
+            print(f"  [{self.name}] ❌ {e!r}")
+            self.error = repr(e)
+        finally:
+            if seen:
+                CRAWL_STATE.record(self.name, seen)
@@ -0,0 +1,40 @@
+"""
+core/fetchers/google_fetcher.py — careers.google.com public JSON API.
+
+Google's careers page loads jobs via a public JSON endpoint.
+"""
+
+from core.fetchers.base import PAGE, JsonFetcher, make_id, make_job, register
+
+
+@register("google")
+class GoogleFetcher(JsonFetcher):
+    source      = "Google"
+    host        = "careers.google.com"
+    pagination  = PAGE
+    page_size   = 20
+    max_pages   = 5
+    incremental = True
+    profile     = "google"
+    items_key   = "jobs"
+    fields      = ("job_id", "title", "locations", "publish_date")
+
+    def request(self, cursor):
+        return "https://careers.google.com/api/v3/search/", {
+            "page":     cursor,
+            "pageSize": self.page_size,
+            "sort_by":  "date",
+        }
+
+    def normalize(self, item):
+        title  = item.get("title", "").strip()
+        job_id = item.get("job_id", "")
+        link   = f"https://careers.google.com/jobs/results/{job_id}/" if job_id else ""
+        if not title or not link:
+            return None
+        locs     = item.get("locations", [])
+        location = locs[0].get("display", "USA") if locs else "USA"
+        return make_job(
+            make_id("goog", job_id), title, "Google", location, link, self.source,
+            item.get("publish_date"),
+        )
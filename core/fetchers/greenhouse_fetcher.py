@@ -1,33 +1,38 @@
-import requests
-from core.database import add_job
+"""
+core/fetchers/greenhouse_fetcher.py — Greenhouse job boards (free public API)
+"""
 
-# Companies using Greenhouse (REAL companies)
-GREENHOUSE_COMPANIES = [
-    "stripe",
-    "discord",
-    "datadog",
-    "cloudflare",
-    "shopify",
-    "airbnb"
-]
+from core.fetchers.base import JsonFetcher, make_id, make_job, register
 
-def fetch_greenhouse_jobs():
-    print("Checking Greenhouse companies...")
 
-    for company in GREENHOUSE_COMPANIES:
-        url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
+@register("greenhouse")
+class GreenhouseFetcher(JsonFetcher):
+    source    = "Greenhouse"
+    host      = "boards-api.greenhouse.io"
+    timeout   = 15
+    snapshot  = True
+    items_key = "jobs"
+    fields    = ("id", "title", "absolute_url", "location", "first_published", "updated_at")
 
-        try:
-            r = requests.get(url, timeout=10)
-            data = r.json()
+    def __init__(self, board: str, **kwargs):
+        super().__init__(**kwargs)
+        self.board = board
 
-            for job in data.get("jobs", []):
-                title = job.get("title", "Unknown")
-                location = job.get("location", {}).get("name", "Remote")
-                link = job.get("absolute_url", "")
-                company_name = company
+    @property
+    def name(self) -> str:
+        return f"Greenhouse:{self.board}"
 
-                add_job(title, company_name, location, link)
+    def request(self, cursor):
+        return f"https://boards-api.greenhouse.io/v1/boards/{self.board}/jobs", None
 
-        except Exception as e:
-            print(f"Failed: {company}", e)
\ No newline at end of file
+    def normalize(self, item):
+        title = item.get("title", "").strip()
+        link  = item.get("absolute_url", "").strip()
+        if not title or not link:
+            return None
+        return make_job(
+            make_id("gh", self.board, item["id"]), title,
+            self.board.replace("-", " ").title(),
+            item.get("location", {}).get("name", "Remote"),
+            link, self.source, item.get("first_published") or item.get("updated_at"),
+        )
@@ -0,0 +1,37 @@
+"""
+core/fetchers/lever_fetcher.py — Lever postings (free public API)
+"""
+
+from core.fetchers.base import JsonFetcher, make_id, make_job, register
+
+
+@register("lever")
+class LeverFetcher(JsonFetcher):
+    source    = "Lever"
+    host      = "api.lever.co"
+    timeout   = 15
+    snapshot  = True
+    items_key = None
+    fields    = ("id", "text", "hostedUrl", "categories", "createdAt")
+
+    def __init__(self, board: str, **kwargs):
+        super().__init__(**kwargs)
+        self.board = board
+
+    @property
+    def name(self) -> str:
+        return f"Lever:{self.board}"
+
+    def request(self, cursor):
+        return f"https://api.lever.co/v0/postings/{self.board}?mode=json", None
+
+    def normalize(self, item):
+        title = item.get("text", "").strip()
+        link  = item.get("hostedUrl", "").strip()
+        if not title or not link:
+            return None
+        location = item.get("categories", {}).get("location", "") or "Remote"
+        return make_job(
+            make_id("lv", self.board, item.get("id", "")), title,
+            self.board.replace("-", " ").title(), location, link, self.source, item.get("createdAt"),
+        )
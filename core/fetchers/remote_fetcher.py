@@ -1,25 +1,52 @@
-import requests
-from core.database import add_job
+"""
+core/fetchers/remote_fetcher.py — Remote-only aggregators: Remotive and RemoteOK
+"""
 
-def fetch_remote_jobs():
-    print("Checking Remote jobs...")
+from core.fetchers.base import JsonFetcher, make_id, make_job, register
 
-    url = "https://remoteok.com/api"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
+@register("remotive")
+class RemotiveFetcher(JsonFetcher):
+    source    = "Remotive"
+    host      = "remotive.com"
+    items_key = "jobs"
+    fields    = ("id", "title", "url", "company_name", "publication_date")
 
-    try:
-        jobs = requests.get(url, headers=headers, timeout=10).json()
+    def request(self, cursor):
+        return "https://remotive.com/api/remote-jobs?limit=100", None
 
-        for job in jobs[1:]:
-            title = job.get("position", "Unknown")
-            company = job.get("company", "Unknown")
-            location = "Remote"
-            link = "https://remoteok.com" + job.get("url", "")
+    def normalize(self, item):
+        title = item.get("title", "").strip()
+        link  = item.get("url", "").strip()
+        if not title or not link:
+            return None
+        return make_job(
+            make_id("rm", item.get("id", "")), title,
+            item.get("company_name", "Unknown"), "Remote", link, self.source,
+            item.get("publication_date"),
+        )
 
-            add_job(title, company, location, link)
 
-    except Exception as e:
-        print("Remote fetch failed:", e)
\ No newline at end of file
+@register("remoteok")
+class RemoteOKFetcher(JsonFetcher):
+    source = "RemoteOK"
+    host   = "remoteok.com"
+
+    def request(self, cursor):
+        return "https://remoteok.com/api", None
+
+    def items(self, data):
+        # First element is the API's legal notice, not a job
+        return data[1:] if isinstance(data, list) else []
+
+    def normalize(self, item):
+        title = (item.get("position") or "").strip()
+        path  = (item.get("url") or "").strip()
+        if not title or not path:
+            return None
+        link = path if path.startswith("http") else "https://remoteok.com" + path
+        return make_job(
+            make_id("rok", item.get("id", path)), title,
+            item.get("company") or "Unknown",
+            item.get("location") or "Remote", link, self.source, item.get("epoch") or item.get("date"),
+        )
@@ -0,0 +1,32 @@
+"""
+core/fetchers/themuse_fetcher.py — The Muse general job board (free)
+"""
+
+from core.fetchers.base import PAGE, JsonFetcher, make_id, make_job, register
+
+
+@register("themuse")
+class TheMuseFetcher(JsonFetcher):
+    source      = "The Muse"
+    host        = "www.themuse.com"
+    pagination  = PAGE
+    max_pages   = 3
+    incremental = True
+    items_key   = "results"
+    fields      = ("id", "name", "refs", "company", "locations", "publication_date")
+
+    def request(self, cursor):
+        return f"https://www.themuse.com/api/public/jobs?page={cursor}&descending=true", None
+
+    def normalize(self, item):
+        title = item.get("name", "").strip()
+        link  = item.get("refs", {}).get("landing_page", "").strip()
+        if not title or not link:
+            return None
+        locs     = item.get("locations", [])
+        location = locs[0].get("name", "Remote") if locs else "Remote"
+        return make_job(
+            make_id("tm", item.get("id", "")), title,
+            item.get("company", {}).get("name", "Unknown"), location, link, self.source,
+            item.get("publication_date"),
+        )
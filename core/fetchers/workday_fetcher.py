@@ -1,50 +1,111 @@
-import requests
-from db.database import add_job
+"""
+core/fetchers/workday_fetcher.py — Workday career sites (MNC tenants).
 
-HEADERS = {
-    "Content-Type": "application/json",
-    "User-Agent": "Mozilla/5.0",
-    "Accept": "application/json"
-}
+Reads `total` from the first page, then fetches the remaining offsets
+concurrently; the collector holds them to `concurrency` in flight per tenant. A
+failed offset marks the whole run as failed, so the circuit breaker sees
+it and the run never counts as a complete snapshot.
+"""
 
-async def fetch_workday(company, tenant):
+import asyncio
+from urllib.parse import urlparse
+from config import WORKDAY_TENANT_CONCURRENCY, WORKDAY_MAX_JOBS
+from core.fetchers.base import OFFSET, JsonFetcher, make_id, make_job, register
 
-    print(f"Fetching Workday jobs from {company}")
 
-    url = f"https://{company}.wd3.myworkdayjobs.com/wday/cxs/{company}/{tenant}/jobs"
+@register("workday")
+class WorkdayFetcher(JsonFetcher):
+    source      = "Workday"
+    pagination  = OFFSET
+    page_size   = 20
+    timeout     = 30
+    concurrency = WORKDAY_TENANT_CONCURRENCY
 
-    payload = {
-        "appliedFacets": {},
-        "limit": 20,
-        "offset": 0,
-        "searchText": "",
-        "locale": "en-US"
-    }
+    def __init__(self, company: str, url: str, max_jobs: int = WORKDAY_MAX_JOBS, **kwargs):
+        super().__init__(**kwargs)
+        parsed = urlparse(url)
+        self.company  = company
+        self.host     = parsed.netloc                      # accenture.wd3.myworkdayjobs.com
+        self.tenant   = self.host.split(".")[0]            # accenture
+        self.site     = parsed.path.rstrip("/").split("/")[-1]   # AccentureCareers
+        self.max_jobs = max_jobs
 
-    try:
-        res = requests.post(url, headers=HEADERS, json=payload, timeout=30)
+    @property
+    def name(self) -> str:
+        return f"Workday:{self.company}"
 
-        if res.status_code != 200:
-            print("Failed:", company, res.status_code, res.text[:120])
-            return
+    def request(self, cursor):
+        return f"https://{self.host}/wday/cxs/{self.tenant}/{self.site}/jobs", {
+            "appliedFacets": {},
+            "limit":         self.page_size,
+            "offset":        cursor,
+            "searchText":    "",
+            "locale":        "en-US",
+        }
 
-        data = res.json()
+    async def fetch(self, http, cursor):
+        # The CXS search endpoint is a JSON POST, so no conditional GET here
+        url, payload = self.request(cursor)
+        return await http.post(url, json=payload, timeout=self.timeout)
 
-        jobs = data.get("jobPostings", [])
-        if not jobs:
-            print("No jobs:", company)
-            return
+    def items(self, data):
+        return data.get("jobPostings", [])
 
-        for job in jobs:
-            title = job.get("title", "Unknown")
-            location = job.get("locationsText", "Unknown")
-            external = job.get("externalPath", "")
+    def normalize(self, item):
+        title    = item.get("title", "").strip()
+        external = item.get("externalPath", "")
+        if not title or not external:
+            return None
+        # externalPath already starts with /job/...
+        link = f"https://{self.host}/{self.site}{external}"
+        return make_job(
+            make_id("wd", self.tenant, external), title, self.company.title(),
+            item.get("locationsText", "Unknown"), link, self.source, item.get("postedOn"),
+        )
 
-            link = f"https://{company}.wd3.myworkdayjobs.com/{tenant}/job/{external}"
+    async def _page(self, http, offset: int) -> list:
+        try:
+            r = await self.fetch(http, offset)
+            if r.status_code != 200:
+                print(f"  [{self.name}] offset {offset} HTTP {r.status_code}")
+                self.error = self.error or f"offset {offset}: HTTP {r.status_code}"
+                return []
+            return [job for job in map(self.normalize, self.items(r.json())) if job]
+        except Exception as e:
+            print(f"  [{self.name}] offset {offset} ❌ {e}")
+            self.error = self.error or f"offset {offset}: {e!r}"
+            return []
 
-            await add_job(title, company.upper(), location, link)
+    async def pages(self, http):
+        count, tasks = 0, []
+        self.error = None
+        try:
+            r = await self.fetch(http, 0)
+            if r.status_code != 200:
+                print(f"  [{self.name}] HTTP {r.status_code}")
+                self.error = f"HTTP {r.status_code}"
+                return
+            data  = r.json()
+            total = min(int(data.get("total") or 0), self.max_jobs)
+            first = [job for job in map(self.normalize, self.items(data)) if job]
+            count += len(first)
+            yield first
 
-        print(f"Saved {len(jobs)} jobs from {company}")
-
-    except Exception as e:
-        print("Error:", company, e)
\ No newline at end of file
+            tasks = [
+                asyncio.create_task(self._page(http, offset))
+                for offset in range(self.page_size, total, self.page_size)
+            ]
+            for done in asyncio.as_completed(tasks):
+                jobs = await done
+                count += len(jobs)
+                yield jobs
+            if self.error is None:
+                print(f"  [{self.name}] ✅ {count}/{total} jobs")
+            else:
+                print(f"  [{self.name}] ⚠️  {count}/{total} jobs, incomplete")
+        except Exception as e:
+            print(f"  [{self.name}] ❌ {e!r}")
+            self.error = repr(e)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,72 @@
+"""
+core/fingerprint.py — Source-independent identity for a job posting.
+
+make_id() hashes source-specific ids, so the same posting seen on a
+company's Greenhouse board and on an aggregator gets two rows. The
+fingerprint instead hashes the normalized company, title and location plus
+a canonical apply link (tracking params stripped, ATS job ids extracted),
+and jobs.fingerprint carries a unique index so copies merge at ingest.
+"""
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+TRACKING_PARAMS = {
+    "ref", "referrer", "source", "src", "trk", "gh_src", "lever-source",
+    "lever-origin", "fbclid", "gclid", "mc_cid", "mc_eid", "campaign",
+}
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "plc", "gmbh", "pvt", "private"}
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+_LEVER    = re.compile(r"^/[^/]+/([0-9a-f-]{36})")
+_GH_BOARD = re.compile(r"^/[^/]+/jobs/(\d+)")
+
+
+def _words(text: str) -> list:
+    return _NON_WORD.sub(" ", (text or "").lower()).split()
+
+
+def normalize_company(name: str) -> str:
+    words = _words(name)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(_words(title))
+
+
+def normalize_location(location: str) -> str:
+    words = _words(location)
+    return "remote" if "remote" in words else " ".join(words)
+
+
+def canonical_link(url: str) -> str:
+    parts = urlsplit((url or "").strip())
+    host  = parts.netloc.lower().removeprefix("www.")
+    path  = parts.path.rstrip("/")
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+
+    # Same ATS posting embedded on different hosts
+    params = dict(query)
+    if "gh_jid" in params:
+        return f"greenhouse/{params['gh_jid']}"
+    if host.endswith("greenhouse.io") and (m := _GH_BOARD.match(path)):
+        return f"greenhouse/{m.group(1)}"
+    if host == "jobs.lever.co" and (m := _LEVER.match(path)):
+        return f"lever/{m.group(1)}"
+
+    return host + path + ("?" + urlencode(sorted(query)) if query else "")
+
+
+def fingerprint(company: str, title: str, location: str, link: str) -> str:
+    key = "|".join((
+        normalize_company(company), normalize_title(title),
+        normalize_location(location), canonical_link(link),
+    ))
+    return hashlib.sha1(key.encode()).hexdigest()
@@ -0,0 +1,91 @@
+"""
+core/http_cache.py — Conditional GET validators (ETag / Last-Modified) per URL.
+
+Validators live in the http_cache table. A response counts as unchanged
+when the server answers 304, or when it sends no usable validators but
+the body hashes the same as last time. New validators are only staged
+while fetching and are persisted by flush() once the jobs are saved, so
+a crash mid-tick never hides unsaved postings behind a 304. Entries are
+staged per owner (the fetcher's name); when an owner's jobs fail to save,
+discard(owner) puts its previous validators back.
+"""
+
+import hashlib
+import httpx
+from typing import Optional
+from db.database import load_http_cache, save_http_cache
+
+
+class ValidatorCache:
+    def __init__(self):
+        self._entries = {}   # key → (etag, last_modified, content_hash)
+        self._staged  = {}
+        self._owners  = {}   # owner → {key: entry before this tick}
+        self._loaded  = False
+        self.hits     = 0
+        self.misses   = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        return str(httpx.URL(url, params=params)) if params else url
+
+    async def load(self):
+        if not self._loaded:
+            self._entries = await load_http_cache()
+            self._loaded  = True
+
+    def reset_counters(self):
+        self.hits = self.misses = 0
+
+    def request_headers(self, key: str) -> dict:
+        etag, last_modified, _ = self._entries.get(key, (None, None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def unchanged(self, key: str, r: httpx.Response, owner: Optional[str] = None,
+                  digest: Optional[str] = None) -> bool:
+        """
+        Record a hit/miss for r and return True when its body can be skipped.
+        `digest` is the body's SHA-1 when it was streamed rather than read.
+        """
+        if r.status_code == 304:
+            self.hits += 1
+            return True
+        if r.status_code != 200:
+            return False
+
+        digest = digest or hashlib.sha1(r.content).hexdigest()
+        entry  = (r.headers.get("etag"), r.headers.get("last-modified"), digest)
+        known  = self._entries.get(key)
+        if known and known[2] == digest:
+            self.hits += 1
+            if known != entry:
+                self._stage(key, entry, owner)
+            return True
+
+        self.misses += 1
+        self._stage(key, entry, owner)
+        return False
+
+    def _stage(self, key: str, entry: tuple, owner: Optional[str]):
+        if owner is not None:
+            self._owners.setdefault(owner, {}).setdefault(key, self._entries.get(key))
+        self._entries[key] = entry
+        self._staged[key]  = entry
+
+    def discard(self, owner: str):
+        """Drop what `owner` staged this tick; its next fetch compares against the saved state."""
+        for key, previous in self._owners.pop(owner, {}).items():
+            self._staged.pop(key, None)
+            if previous is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = previous
+
+    async def flush(self):
+        staged, self._staged, self._owners = self._staged, {}, {}
+        await save_http_cache(staged)
@@ -0,0 +1,141 @@
+"""
+core/http_pool.py — One long-lived, pooled httpx client shared by every fetcher.
+
+Created in main.post_init and closed on shutdown, so TLS sessions and
+keep-alive connections survive across boards and across ticks. Every
+request gets separate connect/read timeouts and is retried with jittered
+exponential backoff on 429/5xx and connection failures.
+"""
+
+import asyncio
+import hashlib
+import httpx
+from typing import Callable, Optional
+from core.http_cache import ValidatorCache
+from core.resilience import RETRY_ERRORS, RETRY_STATUSES, backoff_delay, retry_after
+from config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_SECS, HTTP2_ENABLED,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_MAX_BACKOFF,
+)
+
+BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+}
+
+# Extra headers layered on top of BASE_HEADERS per source
+HEADER_PROFILES = {
+    "default": {},
+    "amazon":  {"Referer": "https://www.amazon.jobs/en/search"},
+    "google":  {"Referer": "https://careers.google.com/"},
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpPool:
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_SECS,
+        http2: bool = HTTP2_ENABLED,
+    ):
+        if http2 and not _http2_available():
+            print("[HttpPool] HTTP/2 requested but 'h2' is not installed — using HTTP/1.1")
+            http2 = False
+        self.http2   = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = None
+        self.cache   = ValidatorCache()
+        self.retries = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=BASE_HEADERS,
+                limits=self._limits,
+                http2=self.http2,
+                timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            )
+        return self._client
+
+    async def request(
+        self, method: str, url: str, *, timeout: Optional[float] = None, stream: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send with retries. `timeout` is the read timeout in seconds; connects
+        always use HTTP_CONNECT_TIMEOUT so a dead host fails fast. With
+        `stream`, the body is left unread and the caller must aclose() it.
+        """
+        timeout = httpx.Timeout(timeout or HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        for attempt in range(HTTP_RETRIES + 1):
+            try:
+                request = self.client.build_request(method, url, timeout=timeout, **kwargs)
+                r = await self.client.send(request, stream=stream)
+            except RETRY_ERRORS:
+                if attempt == HTTP_RETRIES:
+                    raise
+                delay = backoff_delay(attempt)
+            else:
+                if r.status_code not in RETRY_STATUSES or attempt == HTTP_RETRIES:
+                    return r
+                delay = retry_after(r)
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                elif delay > HTTP_MAX_BACKOFF:
+                    return r    # throttled for longer than we are willing to wait
+                await r.aclose()
+            self.retries += 1
+            await asyncio.sleep(min(delay, HTTP_MAX_BACKOFF))
+
+    async def get(self, url: str, *, profile: str = "default", **kwargs) -> httpx.Response:
+        return await self.request("GET", url, headers=HEADER_PROFILES[profile], **kwargs)
+
+    async def get_if_changed(
+        self, url: str, *, params: Optional[dict] = None, profile: str = "default",
+        owner: Optional[str] = None, consume: Optional[Callable[[bytes], None]] = None, **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Conditional GET — returns None when the body is unchanged since last tick.
+        With `consume`, a 200 body is streamed into consume() chunk by chunk
+        and hashed on the way, so it is never held whole (r.content is unset).
+        """
+        key     = self.cache.key(url, params)
+        headers = {**HEADER_PROFILES[profile], **self.cache.request_headers(key)}
+        if consume is None:
+            r = await self.request("GET", url, params=params, headers=headers, **kwargs)
+            return None if self.cache.unchanged(key, r, owner) else r
+
+        r = await self.request("GET", url, params=params, headers=headers, stream=True, **kwargs)
+        digest = None
+        try:
+            if r.status_code == 200:
+                sha = hashlib.sha1()
+                async for chunk in r.aiter_bytes():
+                    sha.update(chunk)
+                    consume(chunk)
+                digest = sha.hexdigest()
+        finally:
+            await r.aclose()
+        return None if self.cache.unchanged(key, r, owner, digest) else r
+
+    async def post(self, url: str, *, profile: str = "default", **kwargs) -> httpx.Response:
+        return await self.request("POST", url, headers=HEADER_PROFILES[profile], **kwargs)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,167 @@
+"""
+core/jsonfast.py — Faster / lower-memory JSON decoding for board payloads.
+
+loads() uses orjson when it is installed, else the stdlib.
+
+ItemScanner walks one array inside a payload ({"jobs": [...]} or a
+top-level [...]) straight from the raw bytes as they arrive, decoding one
+element at a time and keeping only the requested fields of each. Neither
+the whole body nor its object tree ever exists in memory at once.
+ItemReader puts it behind a size threshold: small bodies are buffered and
+decoded in one go, which is faster.
+"""
+
+import json
+import re
+from typing import Callable, Iterator, List, Optional, Sequence
+
+try:
+    import orjson
+    loads = orjson.loads
+    FAST_PARSER = "orjson"
+except ImportError:
+    loads = json.loads
+    FAST_PARSER = None
+
+CHUNK = 64 * 1024
+
+# UTF-8 continuation bytes are all >= 0x80, so these never match inside a character
+_TOP     = re.compile(rb'[\[\]{}",:]')     # ':' and ',' only matter at the top level
+_NESTED  = re.compile(rb'[\[\]{}"]')
+_INSIDE  = re.compile(rb'["\\]')
+_QUOTE, _COLON = ord('"'), ord(":")
+_OPEN, _CLOSE = b"[{", b"]}"
+_LBRACE = ord("{")
+
+
+class ItemScanner:
+    """
+    Incremental scanner: feed() it the body's bytes in any chunking and it
+    returns the array elements completed so far, projected down to `fields`.
+    Only the element being read (and any unscanned tail) stays buffered.
+    """
+
+    def __init__(self, key: Optional[str], fields: Sequence[str]):
+        self.key    = key
+        self.fields = tuple(fields)
+        self.done   = False    # the top-level value has been read to its end
+        self._buf   = bytearray()
+        self._pos   = 0        # next byte to scan (may run one past the end after a '\')
+        self._depth = 0
+        self._top   = None     # first byte of the top-level value, '{' or '['
+        self._array = None     # depth inside the target array, once it is found
+        self._item  = None     # offset of the '{' of the element being read
+        self._str   = None     # offset of the opening quote while inside a string
+        self._name  = None     # last key read at the top level of an object
+        self._value = False    # top-level object: past the ':' of the current member
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        buf  = self._buf
+        buf += chunk
+        out  = []
+        while not self.done:
+            if self._str is not None:
+                m = _INSIDE.search(buf, self._pos)
+                if m is None:
+                    self._pos = max(self._pos, len(buf))
+                    break
+                i = m.start()
+                if buf[i] != _QUOTE:
+                    self._pos = i + 2      # skip the escaped byte
+                    continue
+                self._pos = i + 1
+                if self._depth == 1 and self._top == _LBRACE and not self._value:
+                    self._name = loads(buf[self._str:i + 1])
+                self._str = None
+                continue
+
+            m = (_TOP if self._depth <= 1 else _NESTED).search(buf, self._pos)
+            if m is None:
+                self._pos = max(self._pos, len(buf))
+                break
+            i = m.start()
+            c = buf[i]
+            self._pos = i + 1
+            if c == _QUOTE:
+                self._str = i
+            elif c in _OPEN:
+                if self._depth == 0:
+                    self._top = c
+                    if self.key is None and c != _LBRACE:
+                        self._array = 1
+                elif self._depth == self._array and c == _LBRACE:
+                    self._item = i
+                elif (self._array is None and self._depth == 1 and c != _LBRACE
+                      and self._value and self._name == self.key):
+                    self._array = 2
+                self._depth += 1
+            elif c in _CLOSE:
+                self._depth -= 1
+                if self._depth < 0:
+                    raise ValueError(f"unbalanced {chr(c)!r} in JSON body")
+                if self._item is not None and self._depth == self._array:
+                    item = loads(buf[self._item:i + 1])
+                    out.append({f: item[f] for f in self.fields if f in item})
+                    self._item = None
+                if self._depth == 0:
+                    self.done = True
+            elif self._depth == 1:
+                self._value = c == _COLON
+
+        # Drop everything already scanned that no pending element or key still needs
+        keep = min(x for x in (self._item, self._str, self._pos, len(buf)) if x is not None)
+        if keep:
+            del buf[:keep]
+            self._pos -= keep
+            if self._item is not None:
+                self._item -= keep
+            if self._str is not None:
+                self._str -= keep
+        return out
+
+    def close(self):
+        """Raise if the body ended before its top-level value did (a truncated board)."""
+        if not self.done:
+            raise ValueError("JSON body ended early")
+
+
+class ItemReader:
+    """
+    Collects the items of one body fed in chunks. Bodies under `threshold`
+    bytes are buffered and decoded with loads() (`items_of` then picks the
+    array out of the decoded payload); past it, the buffered head goes to an
+    ItemScanner and the rest is scanned as it arrives.
+    """
+
+    def __init__(self, key: Optional[str], fields: Sequence[str], threshold: int,
+                 items_of: Callable[[object], list]):
+        self.key, self.fields, self.threshold = key, fields, threshold
+        self.items_of = items_of
+        self.items    = []
+        self._head    = bytearray()
+        self._scanner = None
+
+    def feed(self, chunk: bytes):
+        if self._scanner is None:
+            self._head += chunk
+            if len(self._head) < self.threshold:
+                return
+            self._scanner = ItemScanner(self.key, self.fields)
+            chunk, self._head = self._head, bytearray()
+        self.items.extend(self._scanner.feed(chunk))
+
+    def close(self) -> list:
+        if self._scanner is None:
+            return self.items_of(loads(self._head))
+        self._scanner.close()
+        return self.items
+
+
+def iter_items(body: bytes, key: Optional[str], fields: Sequence[str]) -> Iterator[dict]:
+    """Yield each object of the array in an in-memory body, projected down to `fields`."""
+    scanner = ItemScanner(key, fields)
+    view    = memoryview(body)
+    for start in range(0, len(body), CHUNK):
+        yield from scanner.feed(view[start:start + CHUNK])
+    scanner.close()
+
@@ -1,43 +1,180 @@
 """
 core/matcher.py — Sends job alerts to users based on skill + company
+
+Each user has a watermark on the ingest sequence (jobs.seq): only jobs
+ingested after it are matched, and it moves forward as alerts go out. It
+never lags more than ALERT_LOOKBACK_HOURS, so one user who fell behind
+can not make every tick reload a growing range of jobs, and a chat that
+can no longer be reached (bot blocked, chat deleted) is moved to the top.
+Delivered alerts are also logged per job for NOTIFIED_RETENTION_DAYS, so a
+job that is archived and ingested again under a new seq is not re-sent.
+
+Matching is inverted: users are grouped by subscription (skill, company),
+the jobs ingested since the oldest watermark are loaded once, and each
+subscription is evaluated once against them through small in-memory
+indexes (skill tag → jobs, company key → jobs). The result is a fan-out
+plan, subscription → jobs → chat_ids, so matching cost follows the number
+of distinct subscriptions and new jobs, not the number of users. The
+alerts are then handed to the rate-limited delivery engine (core/delivery).
 """
 
-from telegram import Bot
-from db.database import get_all_users, get_unnotified_jobs, mark_notified
+import asyncio
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Set, Tuple
+from telegram.error import BadRequest, Forbidden
+from config import ALERT_LOOKBACK_HOURS
+from core.delivery import ALERT, DELIVERY
+from core.digest import PARSE_MODE, job_card, pack_digest, preview_options
+from db.database import (
+    NOTIFY_BATCH, SKILL_KEYWORDS, advance_watermarks, company_key_of, current_seq,
+    get_jobs_since, get_notified, get_subscriptions, mark_notified, match_skill_since,
+    seq_before,
+)
+
+SubscriptionKey = Tuple[str, str]   # (skill, company) as chosen in /start
+
+
+@dataclass
+class FanoutPlan:
+    top:         int                  # ingest sequence the plan was built at
+    deliveries:  Dict[SubscriptionKey, List[Tuple[dict, List[int]]]] = field(default_factory=dict)
+    subscribers: Dict[int, int]       = field(default_factory=dict)   # chat_id → jobs planned
+    digest:      Set[int]             = field(default_factory=set)    # chat_ids in digest mode
+
+    @property
+    def messages(self) -> int:
+        return sum(len(chat_ids) for jobs in self.deliveries.values() for _, chat_ids in jobs)
+
+
+class _JobIndex:
+    """The new jobs, indexed by skill tag and company key."""
+
+    def __init__(self, jobs: List[dict]):
+        self.jobs       = jobs                                  # seq order
+        self.by_skill   = {}
+        self.by_company = {}
+        for job in jobs:
+            for skill in job["skills"]:
+                self.by_skill.setdefault(skill, set()).add(job["id"])
+            self.by_company.setdefault(job["company_key"], set()).add(job["id"])
+
+    async def match(self, skill: str, company: str, since: int) -> List[dict]:
+        ids = None
+        if skill != "Any":
+            if skill in SKILL_KEYWORDS:
+                ids = self.by_skill.get(skill, set())
+            else:
+                ids = await match_skill_since(skill, since)     # free-text skill: jobs_fts
+        key = company_key_of(company)
+        if key is not None:
+            company_ids = self.by_company.get(key, set())
+            ids = company_ids if ids is None else ids & company_ids
+        if ids is None:
+            return self.jobs
+        return [job for job in self.jobs if job["id"] in ids]
 
 
-async def notify_users(bot: Bot):
-    """Check all users for new matching jobs and send alerts."""
-    async with __import__('aiosqlite').connect(__import__('config').DB_NAME) as db:
-        rows = await db.execute_fetchall(
-            "SELECT chat_id, skill, company FROM users"
-        )
-    users = [{"chat_id": r[0], "skill": r[1], "company": r[2]} for r in rows]
+async def plan_fanout() -> FanoutPlan:
+    """Match every subscription against the jobs its users have not seen yet."""
+    top    = await current_seq()
+    groups = await get_subscriptions()
+    plan   = FanoutPlan(top)
+    if not groups:
+        return plan
 
-    print(f"[Matcher] Checking {len(users)} users for new matches...")
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=ALERT_LOOKBACK_HOURS)
+    floor  = await seq_before(cutoff.strftime("%Y-%m-%d %H:%M:%S"))
+    since  = max(floor, min(wm for members in groups.values() for _, wm, _ in members))
+    index  = _JobIndex(await get_jobs_since(since))
+    sent   = await get_notified([job["id"] for job in index.jobs])
 
-    for user in users:
-        chat_id = user["chat_id"]
-        skill   = user["skill"]
-        company = user["company"]
+    for (skill, company), members in groups.items():
+        matched = await index.match(skill, company, since)
+        seqs    = [job["seq"] for job in matched]
+        fanout  = {}     # job position → chat_ids
+        for chat_id, watermark, mode in members:
+            # Each user gets the oldest NOTIFY_BATCH matches past their own
+            # watermark that were not already sent to them
+            batch = []
+            for pos in range(bisect_right(seqs, max(watermark, floor)), len(matched)):
+                if len(batch) == NOTIFY_BATCH:
+                    break
+                if (chat_id, matched[pos]["id"]) not in sent:
+                    batch.append(pos)
+            for pos in batch:
+                fanout.setdefault(pos, []).append(chat_id)
+            plan.subscribers[chat_id] = len(batch)
+            if mode == "digest":
+                plan.digest.add(chat_id)
+        if fanout:
+            plan.deliveries[(skill, company)] = [(matched[pos], fanout[pos]) for pos in sorted(fanout)]
+    return plan
 
-        new_jobs = await get_unnotified_jobs(chat_id, skill, company)
 
-        for job in new_jobs:
-            msg = (
-                f"🔔 *New Job Alert!*\n\n"
-                f"🏢 *{job['company']}*\n"
-                f"💼 {job['title']}\n"
-                f"📍 {job['location']}\n\n"
-                f"[👉 Apply Here]({job['apply_link']})"
-            )
+ALERT_HEADING = "🔔 *New Job Alert\\!*"
+
+
+async def notify_users():
+    """Match new jobs to subscriptions and queue the alerts on the delivery engine."""
+    plan = await plan_fanout()
+
+    # Instant users get one message per job; digest users one per chat
+    outgoing, digests = {}, {}   # chat_id → [(text, send options, jobs in it)] in seq order
+    for jobs in plan.deliveries.values():
+        for job, chat_ids in jobs:
+            for chat_id in chat_ids:
+                if chat_id in plan.digest:
+                    digests.setdefault(chat_id, []).append(job)
+                else:
+                    outgoing.setdefault(chat_id, []).append((job_card(job, ALERT_HEADING), {}, [job]))
+    for chat_id, jobs in digests.items():
+        heading = f"🔔 *{len(jobs)} new job alerts*" if len(jobs) > 1 else ALERT_HEADING
+        outgoing[chat_id] = [(text, preview_options(packed), packed) for text, packed in pack_digest(heading, jobs)]
+
+    n_messages = sum(len(messages) for messages in outgoing.values())
+    print(
+        f"[Matcher] {len(plan.subscribers)} users in {len(plan.deliveries)} matching subscriptions, "
+        f"{plan.messages} alerts in {n_messages} messages..."
+    )
+
+    failed, gone = set(), set()
+
+    async def deliver(chat_id: int, messages: list):
+        # One message at a time: the first failure ends this chat's batch, so
+        # the watermark only moves over jobs that were delivered, and the
+        # rest are retried next tick
+        for text, options, jobs in messages:
             try:
-                await bot.send_message(
-                    chat_id=chat_id,
-                    text=msg,
-                    parse_mode="Markdown",
-                    disable_web_page_preview=False
-                )
-                await mark_notified(chat_id, job["id"])
+                await DELIVERY.submit(chat_id, ALERT, text=text, parse_mode=PARSE_MODE, **options)
             except Exception as e:
-                print(f"[Matcher] Failed to notify {chat_id}: {e}")
\ No newline at end of file
+                if _unreachable(e):
+                    gone.add(chat_id)
+                else:
+                    failed.add(chat_id)
+                    print(f"[Matcher] Failed to notify {chat_id}: {e}")
+                return
+            await mark_notified(chat_id, [job["id"] for job in jobs], jobs[-1]["seq"])
+
+    # Chats run side by side; the engine paces each of them and the bot
+    await asyncio.gather(*(deliver(chat_id, messages) for chat_id, messages in outgoing.items()))
+    if outgoing:
+        print(f"[Matcher] 📨 Delivery: {DELIVERY.stats.summary()}")
+    if gone:
+        print(f"[Matcher] 🚫 {len(gone)} chats unreachable (bot blocked or chat gone), skipped to the latest job")
+
+    # Everything up to `top` that matched was in their batch: skip past the rest.
+    # Unreachable chats skip too; they come back through /start.
+    await advance_watermarks(
+        [chat_id for chat_id, planned in plan.subscribers.items()
+         if planned < NOTIFY_BATCH and chat_id not in failed or chat_id in gone],
+        plan.top,
+    )
+
+
+def _unreachable(error: Exception) -> bool:
+    """Retrying will never deliver to this chat: blocked bot, deleted or unknown chat."""
+    if isinstance(error, Forbidden):
+        return True
+    return isinstance(error, BadRequest) and "chat not found" in str(error).lower()
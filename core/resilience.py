@@ -0,0 +1,85 @@
+"""
+core/resilience.py — Retry/backoff helpers and per-source circuit breakers.
+
+Retries (429/5xx and connection failures) happen inside HttpPool. Breakers
+work one level up: a source that fails BREAKER_THRESHOLD ticks in a row is
+skipped for BREAKER_COOLDOWN_MIN minutes, then gets a single trial run.
+Breaker state lives in the circuit_breakers table so a restart does not
+re-hammer a dead or throttling API.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import httpx
+from config import HTTP_BACKOFF_BASE, BREAKER_THRESHOLD, BREAKER_COOLDOWN_MIN
+from db.database import load_breakers, save_breakers
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Cheap to retry; a read timeout already cost its full budget, so it is not retried
+RETRY_ERRORS   = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, base * 2^attempt)."""
+    return random.uniform(0, HTTP_BACKOFF_BASE * (2 ** attempt))
+
+
+def retry_after(r: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date)."""
+    value = r.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreakers:
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown_min: int = BREAKER_COOLDOWN_MIN):
+        self.threshold = threshold
+        self.cooldown  = cooldown_min * 60
+        self._state    = {}     # source → (consecutive failures, open_until epoch)
+        self._staged   = {}
+        self._loaded   = False
+
+    async def load(self):
+        if not self._loaded:
+            self._state  = await load_breakers()
+            self._loaded = True
+
+    def allow(self, source: str) -> bool:
+        _, open_until = self._state.get(source, (0, 0.0))
+        return time.time() >= open_until
+
+    def record(self, source: str, ok: bool):
+        failures, open_until = self._state.get(source, (0, 0.0))
+        if ok:
+            if failures:
+                self._set(source, 0, 0.0)
+            return
+        failures += 1
+        if failures >= self.threshold:
+            open_until = time.time() + self.cooldown
+            print(f"  [Breaker:{source}] 🔌 open for {self.cooldown // 60} min after {failures} failures")
+        self._set(source, failures, open_until)
+
+    def open_sources(self) -> list:
+        now = time.time()
+        return sorted(s for s, (_, until) in self._state.items() if until > now)
+
+    def _set(self, source: str, failures: int, open_until: float):
+        self._state[source] = self._staged[source] = (failures, open_until)
+
+    async def flush(self):
+        staged, self._staged = self._staged, {}
+        await save_breakers(staged)
+
+
+BREAKERS = CircuitBreakers()
@@ -0,0 +1,74 @@
+"""
+core/retag.py — Rebuild job categories, job_skills tags, company keys and
+missing fingerprints.
+
+Tags are computed once at ingest (core/fetchers/base.make_job), so stored
+jobs go stale when CATEGORY_RULES, SKILL_KEYWORDS or the company aliases
+change. On startup ensure_tags() compares a hash of those tables with the
+one stored in `meta` and reclassifies every job when they differ. It also
+fingerprints jobs stored before fingerprints existed, so they merge with
+copies from other sources. Run by hand with:
+
+    python -m core.retag
+"""
+
+import asyncio
+import hashlib
+import json
+from config import COMPANIES, COMPANY_ALIASES
+from core.classifier import CATEGORY_RULES, classify
+from core.companies import COMPANY_KEYS
+from core.fingerprint import fingerprint
+from db.database import (
+    SKILL_KEYWORDS, close_db, forget_learned_companies, get_meta, init_db,
+    load_job_titles, load_unfingerprinted_jobs, replace_job_tags, set_fingerprints, set_meta,
+)
+
+TAGS_VERSION = hashlib.sha1(
+    json.dumps([CATEGORY_RULES, SKILL_KEYWORDS, COMPANY_ALIASES, COMPANIES], sort_keys=True).encode()
+).hexdigest()
+
+
+async def retag_jobs() -> int:
+    rows = await load_job_titles()
+    await forget_learned_companies()
+    await COMPANY_KEYS.load()
+    await replace_job_tags({
+        job_id: (*classify(title or ""), COMPANY_KEYS.resolve(company or ""))
+        for job_id, title, company in rows
+    })
+    await COMPANY_KEYS.flush()
+    await set_meta("tags_version", TAGS_VERSION)
+    print(f"[Retag] 🏷️  Reclassified {len(rows)} jobs")
+    return len(rows)
+
+
+async def backfill_fingerprints() -> int:
+    rows = await load_unfingerprinted_jobs()
+    if not rows:
+        return 0
+    done = await set_fingerprints({
+        job_id: fingerprint(company, title, location, link)
+        for job_id, company, title, location, link in rows
+    })
+    print(f"[Retag] 🔑 Fingerprinted {done}/{len(rows)} older jobs")
+    return done
+
+
+async def ensure_tags():
+    if await get_meta("tags_version") != TAGS_VERSION:
+        await retag_jobs()
+    await backfill_fingerprints()
+
+
+async def _main():
+    await init_db()
+    try:
+        await retag_jobs()
+        await backfill_fingerprints()
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,20 +1,29 @@
 """
-core/scheduler.py — Runs collector + matcher on a timer
+core/scheduler.py — Runs collector + matcher on a timer, and job retention daily
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from core.collector import collect_all_jobs
 from core.matcher import notify_users
-from config import FETCH_INTERVAL_MINUTES
+from config import (
+    FETCH_INTERVAL_MINUTES, JOB_ARCHIVE_GRACE_HOURS, JOB_MAX_AGE_DAYS,
+    NOTIFIED_RETENTION_DAYS, RETENTION_INTERVAL_HOURS,
+)
+from db.database import archive_closed_jobs, prune_notified
 
 
-def start_scheduler(bot):
+def start_scheduler(http):
     scheduler = AsyncIOScheduler()
 
     async def tick():
         print("[Scheduler] Tick: collecting jobs...")
-        await collect_all_jobs()
-        await notify_users(bot)
+        await collect_all_jobs(http)
+        await notify_users()
+
+    async def retention():
+        archived = await archive_closed_jobs(JOB_ARCHIVE_GRACE_HOURS, JOB_MAX_AGE_DAYS)
+        pruned   = await prune_notified(NOTIFIED_RETENTION_DAYS)
+        print(f"[Scheduler] 🗄️  Archived {archived} closed jobs, pruned {pruned} old alert log rows")
 
     scheduler.add_job(
         tick,
@@ -23,6 +32,13 @@ def start_scheduler(bot):
         id="main_tick",
         replace_existing=True
     )
+    scheduler.add_job(
+        retention,
+        trigger="interval",
+        hours=RETENTION_INTERVAL_HOURS,
+        id="retention",
+        replace_existing=True
+    )
     scheduler.start()
     print(f"[Scheduler] Running every {FETCH_INTERVAL_MINUTES} minutes.")
     return scheduler
\ No newline at end of file
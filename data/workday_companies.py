@@ -1,7 +1,9 @@
-WORKDAY_COMPANIES = [
-    ("ag", "Airbus"),
-    ("accenture", "AccentureCareers"),
-    ("capgemini", "capgemini"),
-    ("dell", "External"),
-    ("nvidia", "NVIDIAExternalCareerSite"),
-]
\ No newline at end of file
+from data.mnc_companies import MNC_COMPANIES
+
+# Workday-hosted MNC career sites: company → public career-site URL
+# e.g. "https://accenture.wd3.myworkdayjobs.com/en-US/AccentureCareers"
+WORKDAY_COMPANIES = {
+    company: url
+    for company, url in MNC_COMPANIES.items()
+    if ".myworkdayjobs.com" in url
+}
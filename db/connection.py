@@ -0,0 +1,215 @@
+"""
+db/connection.py — Process-wide SQLite connections.
+
+All writes go through one asyncio task that owns the only write connection.
+Callers submit a write command (a label plus a coroutine that runs its
+statements); the task drains whatever is queued, runs each command inside
+its own SAVEPOINT and commits the whole group at once, so a burst of
+/start, alert and ingest writes costs one fsync instead of one each. Reads
+use a small pool of read-only connections; WAL lets them run while the
+writer commits.
+"""
+
+import asyncio
+import time
+import aiosqlite
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from config import DB_NAME, DB_READERS, DB_CACHE_KB, DB_MMAP_BYTES, DB_WRITE_GROUP
+
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA cache_size=-{DB_CACHE_KB}",
+    f"PRAGMA mmap_size={DB_MMAP_BYTES}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+WriteFn = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+@dataclass
+class WriteCommand:
+    kind:     str       # label for metrics, e.g. "save_jobs"
+    fn:       WriteFn   # runs the statements on the write connection
+    future:   asyncio.Future
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class WriteStats:
+    """Write-path metrics since the last reset()."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.commands    = 0
+        self.commits     = 0
+        self.errors      = 0
+        self.latency_sum = 0.0   # enqueue → commit, seconds
+        self.latency_max = 0.0
+        self.peak_depth  = 0
+
+    def summary(self) -> str:
+        avg = self.latency_sum / self.commands * 1000 if self.commands else 0.0
+        return (
+            f"{self.commands} writes in {self.commits} commits, "
+            f"latency avg {avg:.1f}ms / max {self.latency_max * 1000:.1f}ms, "
+            f"peak queue {self.peak_depth}" + (f", {self.errors} failed" if self.errors else "")
+        )
+
+
+_STOP = object()
+
+
+class ConnectionManager:
+    def __init__(self, path: str = DB_NAME, readers: int = DB_READERS, group: int = DB_WRITE_GROUP):
+        self.path      = path
+        self.n_readers = max(1, readers)
+        self.group     = max(1, group)
+        self.stats     = WriteStats()
+        self._writer   = None
+        self._readers  = None
+        self._queue    = None
+        self._task     = None
+        self._open_lock = asyncio.Lock()
+
+    async def _connect(self, read_only: bool) -> aiosqlite.Connection:
+        if read_only:
+            uri  = Path(self.path).absolute().as_uri() + "?mode=ro"
+            conn = await aiosqlite.connect(uri, uri=True)
+        else:
+            # Autocommit mode: the writer task issues BEGIN/COMMIT itself
+            conn = await aiosqlite.connect(self.path, isolation_level=None)
+        for pragma in PRAGMAS:
+            await conn.execute_fetchall(pragma)
+        return conn
+
+    async def open(self):
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            conns = []
+            try:
+                conns.append(await self._connect(read_only=False))
+                await conns[0].execute_fetchall("PRAGMA journal_mode=WAL")
+                for _ in range(self.n_readers):
+                    conns.append(await self._connect(read_only=True))
+            except BaseException:
+                # aiosqlite threads are non-daemon; never leak them
+                for conn in conns:
+                    await conn.close()
+                raise
+            readers = asyncio.Queue()
+            for conn in conns[1:]:
+                readers.put_nowait(conn)
+            self._writer, self._readers = conns[0], readers
+            self._queue = asyncio.Queue()
+            self._task  = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        async with self._open_lock:
+            if self._writer is None:
+                return
+            self._queue.put_nowait(_STOP)
+            await self._task
+            while not self._readers.empty():
+                await self._readers.get_nowait().close()
+            await self._writer.close()
+            self._writer = self._readers = self._queue = self._task = None
+
+    @asynccontextmanager
+    async def read(self):
+        if self._writer is None:
+            await self.open()
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    async def submit(self, kind: str, fn: WriteFn) -> Any:
+        """Queue a write command; returns fn's result once its group has committed."""
+        if self._writer is None:
+            await self.open()
+        cmd = WriteCommand(kind, fn, asyncio.get_running_loop().create_future())
+        self._queue.put_nowait(cmd)
+        self.stats.peak_depth = max(self.stats.peak_depth, self._queue.qsize())
+        return await cmd.future
+
+    # ── writer task ──────────────────────────────────────────────────────────
+    async def _write_loop(self):
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            group = [first]
+            while len(group) < self.group and not self._queue.empty():
+                cmd = self._queue.get_nowait()
+                if cmd is _STOP:
+                    self._queue.put_nowait(_STOP)   # finish this group, then stop
+                    break
+                group.append(cmd)
+            try:
+                await self._commit_group(group)
+            except Exception as e:
+                # Never let the writer die: every later submit() would hang
+                print(f"[DB] ❌ write group of {len(group)} failed: {e!r}")
+                await self._abandon(group, e)
+
+    async def _abandon(self, group: list, error: Exception):
+        """Fail a group's unanswered commands and leave the connection out of any transaction."""
+        try:
+            if self._writer.in_transaction:
+                await self._writer.execute("ROLLBACK")
+        except Exception as e:
+            print(f"[DB] ❌ rollback failed: {e!r}")
+        for cmd in group:
+            if not cmd.future.done():
+                self.stats.errors += 1
+                cmd.future.set_exception(error)
+
+    async def _commit_group(self, group: list):
+        db, results = self._writer, []
+        try:
+            await db.execute("BEGIN IMMEDIATE")
+            for cmd in group:
+                if cmd.future.done():          # caller gave up before we got to it
+                    results.append(None)
+                    continue
+                await db.execute("SAVEPOINT cmd")
+                try:
+                    results.append((True, await cmd.fn(db)))
+                    await db.execute("RELEASE cmd")
+                except Exception as e:
+                    # Only this command is undone; the rest of the group still commits
+                    await db.execute("ROLLBACK TO cmd")
+                    await db.execute("RELEASE cmd")
+                    results.append((False, e))
+            await db.execute("COMMIT")
+        except Exception as e:
+            if db.in_transaction:
+                await db.execute("ROLLBACK")
+            results = [(False, e)] * len(group)
+
+        now = time.perf_counter()
+        self.stats.commits += 1
+        for cmd, outcome in zip(group, results):
+            if outcome is None or cmd.future.done():
+                continue
+            ok, value = outcome
+            latency = now - cmd.enqueued
+            self.stats.commands    += 1
+            self.stats.latency_sum += latency
+            self.stats.latency_max  = max(self.stats.latency_max, latency)
+            if ok:
+                cmd.future.set_result(value)
+            else:
+                self.stats.errors += 1
+                print(f"[DB] ❌ {cmd.kind} failed: {value}")
+                cmd.future.set_exception(value)
+
+
+db_manager = ConnectionManager()
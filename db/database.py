@@ -1,87 +1,674 @@
 """
 db/database.py — Skill + Company filtering
+
+Skill filters are lookups on job_skills, the tags the classifier computed
+at ingest; free-text skills and relevance ranking use the jobs_fts
+full-text index (title + category). See _skill_source().
 """
 
-import aiosqlite
-from config import DB_NAME, COMPANY_ALIASES
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from config import ALERT_MODE, COMPANY_ALIASES, SEARCH_BM25
+from core.fingerprint import normalize_company
+from db.connection import db_manager
+from db.search_cache import SEARCH_CACHE
 
 # ─────────────────────────────────────────────────────
 # INIT
 # ─────────────────────────────────────────────────────
+_CURRENT_SEQ = "(SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'ingest_seq')"
+
+
 async def init_db():
-    async with aiosqlite.connect(DB_NAME) as db:
+    async def op(db):
         await db.execute("""
         CREATE TABLE IF NOT EXISTS users (
-            chat_id  INTEGER PRIMARY KEY,
-            username TEXT,
-            skill    TEXT,
-            company  TEXT
+            chat_id   INTEGER PRIMARY KEY,
+            username  TEXT,
+            skill     TEXT,
+            company   TEXT,
+            watermark INTEGER,    -- last jobs.seq this user was alerted up to
+            alert_mode TEXT       -- 'instant' | 'digest', NULL = config.ALERT_MODE
         )""")
+        added = await _add_columns(db, "users", {"watermark": "INTEGER", "alert_mode": "TEXT"})
+        if "alert_mode" in added:
+            # Users from before /mode keep the one-message-per-job alerts they
+            # signed up for; only new ones get config.ALERT_MODE
+            await db.execute("UPDATE users SET alert_mode = 'instant'")
         await db.execute("""
         CREATE TABLE IF NOT EXISTS jobs (
-            id         TEXT PRIMARY KEY,
-            title      TEXT,
-            company    TEXT,
-            location   TEXT,
-            category   TEXT,
-            apply_link TEXT,
-            source     TEXT
+            id          TEXT PRIMARY KEY,
+            title       TEXT,
+            company     TEXT,
+            location    TEXT,
+            category    TEXT,
+            apply_link  TEXT,
+            source      TEXT,
+            fingerprint TEXT,     -- core/fingerprint.py, same across sources
+            sources     TEXT,     -- comma-separated, every source that listed it
+            board       TEXT,     -- fetcher that first stored it, e.g. "Greenhouse:stripe"
+            first_seen  TEXT,
+            last_seen   TEXT,
+            closed      INTEGER DEFAULT 0,
+            company_key TEXT,     -- core/companies.py, e.g. "Meta" or "metabase"
+            seq         INTEGER,  -- ingest sequence, only ever grows (meta.ingest_seq)
+            posted_at   TEXT      -- source's posting date (UTC), else first_seen
         )""")
+        await _add_columns(db, "jobs", {
+            "fingerprint": "TEXT", "sources": "TEXT", "board": "TEXT",
+            "first_seen": "TEXT", "last_seen": "TEXT", "closed": "INTEGER DEFAULT 0",
+            "company_key": "TEXT", "seq": "INTEGER", "posted_at": "TEXT",
+        })
+        # Rows from before lifecycle tracking start their clock now
+        await db.execute(
+            "UPDATE jobs SET first_seen = datetime('now'), last_seen = datetime('now') "
+            "WHERE last_seen IS NULL"
+        )
+        await db.execute("UPDATE jobs SET posted_at = first_seen WHERE posted_at IS NULL")
+        await db.execute("UPDATE jobs SET sources = source WHERE sources IS NULL")
+        await db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs(fingerprint)"
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_board ON jobs(board, closed)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company_key, closed)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_seq ON jobs(seq)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs(first_seen)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted_at)")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS job_skills (
+            skill  TEXT,
+            job_id TEXT,
+            PRIMARY KEY(skill, job_id)
+        ) WITHOUT ROWID""")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills(job_id)")
+        await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS job_skills_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_skills WHERE job_id = old.id;
+        END""")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS company_map (
+            name        TEXT PRIMARY KEY,   -- normalized raw company name
+            company_key TEXT,
+            manual      INTEGER DEFAULT 0   -- 1 = added by hand, kept across retags
+        )""")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        )""")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_archive (
+            id          TEXT PRIMARY KEY,
+            title       TEXT,
+            company     TEXT,
+            location    TEXT,
+            category    TEXT,
+            apply_link  TEXT,
+            source      TEXT,
+            fingerprint TEXT,
+            sources     TEXT,
+            board       TEXT,
+            first_seen  TEXT,
+            last_seen   TEXT,
+            company_key TEXT,
+            seq         INTEGER,
+            posted_at   TEXT,
+            archived_at TEXT
+        )""")
+        await _add_columns(db, "jobs_archive", {"company_key": "TEXT", "seq": "INTEGER", "posted_at": "TEXT"})
+        # Short-lived dedup log next to the per-user watermark; pruned by prune_notified()
         await db.execute("""
         CREATE TABLE IF NOT EXISTS notified (
             chat_id INTEGER,
             job_id  TEXT,
+            sent_at TEXT,
             PRIMARY KEY(chat_id, job_id)
         )""")
-        await db.commit()
+        await _add_columns(db, "notified", {"sent_at": "TEXT"})
+        await db.execute("UPDATE notified SET sent_at = datetime('now') WHERE sent_at IS NULL")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_notified_sent ON notified(sent_at)")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            key           TEXT PRIMARY KEY,
+            etag          TEXT,
+            last_modified TEXT,
+            content_hash  TEXT
+        )""")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS circuit_breakers (
+            source     TEXT PRIMARY KEY,
+            failures   INTEGER,
+            open_until REAL       -- epoch seconds
+        )""")
+        await db.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            source     TEXT PRIMARY KEY,
+            recent_ids TEXT,      -- JSON list, newest first
+            updated_at TEXT
+        )""")
+        await _init_sequence(db)
+        await _init_fts(db)
+        await _init_stats(db)
+
+    await db_manager.submit("init_db", op)
+
+
+async def _add_columns(db, table: str, columns: dict) -> set:
+    """Add columns missing from a table created by an older version; returns the added names."""
+    existing = {r[1] for r in await db.execute_fetchall(f"PRAGMA table_info({table})")}
+    added = set()
+    for name, decl in columns.items():
+        if name not in existing:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+            added.add(name)
+    return added
+
+
+async def _init_sequence(db):
+    """Number jobs from before the ingest sequence; start old users' watermarks at the top."""
+    await db.execute("UPDATE jobs SET seq = rowid WHERE seq IS NULL")
+    await db.execute("""
+    INSERT INTO meta(key, value) VALUES ('ingest_seq', (SELECT COALESCE(MAX(seq), 0) FROM jobs))
+    ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))
+    """)
+    await db.execute(f"UPDATE users SET watermark = {_CURRENT_SEQ} WHERE watermark IS NULL")
+
+
+async def _init_fts(db):
+    """
+    Full-text index over jobs(title, category), kept in sync by triggers.
+    It is keyed on jobs.seq, not the implicit rowid: jobs has a TEXT primary
+    key, so VACUUM may renumber its rowids, while seq is ours and unique.
+    """
+    sql = await db.execute_fetchall(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+    )
+    if sql and "content_rowid='seq'" not in sql[0][0]:
+        # Built by an older version on rowid: start over
+        for trigger in ("jobs_fts_insert", "jobs_fts_delete", "jobs_fts_update"):
+            await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        await db.execute("DROP TABLE jobs_fts")
+        sql = []
+    await db.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, category, content='jobs', content_rowid='seq'
+    )""")
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, category) VALUES (new.seq, new.title, new.category);
+    END""")
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, category)
+        VALUES ('delete', old.seq, old.title, old.category);
+    END""")
+    await db.execute("""
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, category ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, category)
+        VALUES ('delete', old.seq, old.title, old.category);
+        INSERT INTO jobs_fts(rowid, title, category) VALUES (new.seq, new.title, new.category);
+    END""")
+    if not sql:
+        await db.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def _count(dim: str, key: str, delta: str) -> str:
+    """Trigger statement adding `delta` to one stats counter."""
+    return (f"INSERT INTO stats(dim, key, n) VALUES ('{dim}', {key}, {delta}) "
+            "ON CONFLICT(dim, key) DO UPDATE SET n = n + excluded.n;")
+
+
+# (dim, key expression) per job; "day" is when it was first ingested
+_JOB_DIMS = (
+    ("source",   "COALESCE({r}.source, '')"),
+    ("category", "COALESCE({r}.category, '')"),
+    ("company",  "COALESCE({r}.company_key, '')"),
+)
+
+
+async def _init_stats(db):
+    """
+    Counters behind /stats, kept current by triggers so reading them never
+    scans jobs. dim is 'total' (jobs, closed, users), 'source', 'category',
+    'company' or 'day'. Day counts are jobs ingested that day and are not
+    decremented when a job is archived.
+    """
+    exists = await db.execute_fetchall(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='stats'"
+    )
+    await db.execute("""
+    CREATE TABLE IF NOT EXISTS stats (
+        dim TEXT,
+        key TEXT,
+        n   INTEGER,
+        PRIMARY KEY(dim, key)
+    ) WITHOUT ROWID""")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_stats_rank ON stats(dim, n)")
+
+    def dims(row: str, delta: str) -> str:
+        return "\n".join(_count(dim, key.format(r=row), delta) for dim, key in _JOB_DIMS)
+
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_jobs_insert AFTER INSERT ON jobs BEGIN
+        {_count("total", "'jobs'", "1")}
+        {_count("day", "substr(new.first_seen, 1, 10)", "1")}
+        {dims("new", "1")}
+    END""")
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_jobs_delete AFTER DELETE ON jobs BEGIN
+        {_count("total", "'jobs'", "-1")}
+        {_count("total", "'closed'", "-old.closed")}
+        {dims("old", "-1")}
+    END""")
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_jobs_retag AFTER UPDATE OF category, company_key ON jobs BEGIN
+        {dims("old", "-1")}
+        {dims("new", "1")}
+    END""")
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_jobs_closed AFTER UPDATE OF closed ON jobs
+    WHEN old.closed IS NOT new.closed BEGIN
+        {_count("total", "'closed'", "new.closed - old.closed")}
+    END""")
+    # save_user upserts: a REPLACE would not fire the delete trigger
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_users_insert AFTER INSERT ON users BEGIN
+        {_count("total", "'users'", "1")}
+    END""")
+    await db.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS stats_users_delete AFTER DELETE ON users BEGIN
+        {_count("total", "'users'", "-1")}
+    END""")
+    if not exists:
+        await _rebuild_stats(db)
+
+
+async def _rebuild_stats(db):
+    """Recount every counter from the tables (first run, or after hand edits)."""
+    await db.execute("DELETE FROM stats")
+    await db.execute("""
+    INSERT INTO stats(dim, key, n)
+    SELECT 'total', 'jobs', COUNT(*) FROM jobs
+    UNION ALL SELECT 'total', 'closed', COUNT(*) FROM jobs WHERE closed = 1
+    UNION ALL SELECT 'total', 'users', COUNT(*) FROM users
+    UNION ALL SELECT 'day', substr(first_seen, 1, 10), COUNT(*) FROM (
+        SELECT first_seen FROM jobs UNION ALL SELECT first_seen FROM jobs_archive
+    ) GROUP BY 2
+    """)
+    for dim, key in _JOB_DIMS:
+        key = key.format(r="jobs")
+        await db.execute(
+            f"INSERT INTO stats(dim, key, n) SELECT '{dim}', {key}, COUNT(*) FROM jobs GROUP BY {key}"
+        )
+
+
+async def close_db():
+    await db_manager.close()
 
 
 # ─────────────────────────────────────────────────────
 # USERS
 # ─────────────────────────────────────────────────────
 async def save_user(chat_id, username, skill, company):
-    async with aiosqlite.connect(DB_NAME) as db:
+    """(Re)subscribe; alerts start from jobs ingested after this point."""
+    async def op(db):
         await db.execute(
-            "INSERT OR REPLACE INTO users(chat_id, username, skill, company) VALUES(?,?,?,?)",
+            "INSERT INTO users(chat_id, username, skill, company, watermark) "
+            f"VALUES(?,?,?,?,{_CURRENT_SEQ}) "
+            "ON CONFLICT(chat_id) DO UPDATE SET username = excluded.username, "
+            "skill = excluded.skill, company = excluded.company, watermark = excluded.watermark",
             (chat_id, username, skill, company)
         )
-        await db.commit()
+
+    await db_manager.submit("save_user", op)
 
 
 async def get_user(chat_id):
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with db_manager.read() as db:
         cursor = await db.execute(
-            "SELECT chat_id, username, skill, company FROM users WHERE chat_id=?",
+            "SELECT chat_id, username, skill, company, alert_mode FROM users WHERE chat_id=?",
             (chat_id,)
         )
         row = await cursor.fetchone()
         if not row:
             return None
-        return {"chat_id": row[0], "username": row[1], "skill": row[2], "company": row[3]}
+        return {"chat_id": row[0], "username": row[1], "skill": row[2], "company": row[3],
+                "mode": row[4] or ALERT_MODE}
+
+
+async def set_alert_mode(chat_id, mode: str):
+    """mode: 'instant' (one message per job) or 'digest' (jobs packed together)."""
+    async def op(db):
+        await db.execute("UPDATE users SET alert_mode = ? WHERE chat_id=?", (mode, chat_id))
+
+    await db_manager.submit("set_alert_mode", op)
 
 
 async def get_all_users():
-    async with aiosqlite.connect(DB_NAME) as db:
+    async with db_manager.read() as db:
         cursor = await db.execute("SELECT chat_id, skill, company FROM users")
         rows = await cursor.fetchall()
         return [{"chat_id": r[0], "skill": r[1], "company": r[2]} for r in rows]
 
 
+async def get_subscriptions() -> dict:
+    """Users grouped by subscription: (skill, company) → [(chat_id, watermark, alert mode)]."""
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall(
+            "SELECT skill, company, chat_id, watermark, alert_mode FROM users"
+        )
+    groups = {}
+    for skill, company, chat_id, watermark, mode in rows:
+        groups.setdefault((skill, company), []).append((chat_id, watermark or 0, mode or ALERT_MODE))
+    return groups
+
+
 # ─────────────────────────────────────────────────────
 # JOBS
 # ─────────────────────────────────────────────────────
-async def save_job(job):
-    async with aiosqlite.connect(DB_NAME) as db:
-        try:
-            await db.execute(
-                "INSERT INTO jobs(id,title,company,location,category,apply_link,source) VALUES(?,?,?,?,?,?,?)",
-                (job["id"], job["title"], job["company"], job["location"],
-                 job["category"], job["apply_link"], job["source"])
+JOB_COLUMNS  = ("id", "title", "company", "location", "category", "apply_link", "source",
+                "fingerprint", "sources", "board", "first_seen", "last_seen", "company_key",
+                "posted_at", "seq")
+INGEST_CHUNK = 50    # rows per INSERT statement (15 params each, well under SQLite's limit)
+
+
+async def save_jobs(jobs, seen_at: str) -> set:
+    """
+    Bulk-insert job dicts in a single transaction, all stamped `seen_at` and
+    numbered from the ingest sequence (gaps are fine, order is what matters).
+    New jobs also get their `skills` tags (from the classifier) written to
+    job_skills. Returns the set of ids that were actually new. A job whose id or
+    fingerprint is already stored is not inserted; the stored row gets its
+    last_seen refreshed (reopening it if it was closed), a fingerprint and
+    board if it predates them, and a fingerprint hit from another source adds that
+    source to its `sources`.
+    """
+    rows = [
+        (job["id"], job["title"], job["company"], job["location"], job["category"],
+         job["apply_link"], job["source"], job.get("fingerprint"), job["source"],
+         job.get("board"), seen_at, seen_at, job.get("company_key"), job.get("posted_at") or seen_at)
+        for job in jobs
+    ]
+    new_ids = set()
+    if not rows:
+        return new_ids
+
+    row_sql = "(" + ",".join("?" * len(JOB_COLUMNS)) + ")"
+
+    async def op(db):
+        base = (await db.execute_fetchall(f"SELECT {_CURRENT_SEQ}"))[0][0] or 0
+        numbered = [row + (base + n,) for n, row in enumerate(rows, 1)]
+        await db.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES ('ingest_seq', ?)", (base + len(numbered),)
+        )
+        for i in range(0, len(numbered), INGEST_CHUNK):
+            chunk  = numbered[i:i + INGEST_CHUNK]
+            cursor = await db.execute(
+                f"INSERT INTO jobs({','.join(JOB_COLUMNS)}) VALUES {','.join([row_sql] * len(chunk))} "
+                "ON CONFLICT DO NOTHING RETURNING id",
+                [v for row in chunk for v in row]
             )
-            await db.commit()
-            return True
-        except:
-            return False
+            new_ids.update(r[0] for r in await cursor.fetchall())
+
+        await db.executemany(
+            "INSERT OR IGNORE INTO job_skills(skill, job_id) VALUES(?,?)",
+            [(skill, job["id"]) for job in jobs if job["id"] in new_ids for skill in job.get("skills", ())]
+        )
+
+        seen = [row for row in numbered if row[0] not in new_ids]
+        # Rows stored before fingerprints existed pick theirs up here (unless
+        # another row already holds it: then they stay a separate posting)
+        await db.executemany(
+            "UPDATE OR IGNORE jobs SET fingerprint = ? WHERE id = ? AND fingerprint IS NULL",
+            [(row[7], row[0]) for row in seen if row[7]]
+        )
+        await db.executemany(
+            "UPDATE jobs SET last_seen = ? WHERE id = ? OR fingerprint = ?",
+            [(seen_at, row[0], row[7]) for row in seen]
+        )
+        # ...and their board, so snapshot sweeps cover them from now on
+        await db.executemany(
+            "UPDATE jobs SET board = ? WHERE id = ? AND board IS NULL",
+            [(row[9], row[0]) for row in seen if row[9]]
+        )
+        reopened = await db.executemany(
+            "UPDATE jobs SET closed = 0 WHERE (id = ? OR fingerprint = ?) AND closed = 1",
+            [(row[0], row[7]) for row in seen]
+        )
+        merged = await db.executemany(
+            "UPDATE jobs SET sources = COALESCE(sources, source) || ',' || ? "
+            "WHERE fingerprint = ? AND id != ? "
+            "AND instr(',' || COALESCE(sources, source) || ',', ',' || ? || ',') = 0",
+            [(row[6], row[7], row[0], row[6]) for row in seen if row[7]]
+        )
+        return reopened.rowcount > 0 or merged.rowcount > 0
+
+    changed = await db_manager.submit("save_jobs", op)
+    if new_ids or changed:
+        SEARCH_CACHE.bump()
+    return new_ids
+
+
+# ─────────────────────────────────────────────────────
+# LIFECYCLE
+# ─────────────────────────────────────────────────────
+async def touch_board(board: str, seen_at: str):
+    """Board body unchanged since last tick: all its open jobs are still listed."""
+    async def op(db):
+        await db.execute(
+            "UPDATE jobs SET last_seen = ? WHERE board = ? AND closed = 0", (seen_at, board)
+        )
+
+    await db_manager.submit("touch_board", op)
+
+
+async def close_missing_jobs(board: str, seen_at: str) -> int:
+    """After a full snapshot of `board`, close its open jobs that were not in it."""
+    async def op(db):
+        cursor = await db.execute(
+            "UPDATE jobs SET closed = 1 WHERE board = ? AND closed = 0 AND last_seen < ?",
+            (board, seen_at)
+        )
+        return cursor.rowcount
+
+    closed = await db_manager.submit("close_missing_jobs", op)
+    if closed > 0:
+        SEARCH_CACHE.bump()
+    return closed
+
+
+async def archive_closed_jobs(grace_hours: int, max_age_days: int) -> int:
+    """
+    Move postings out of the hot table: closed ones once they have stayed
+    closed for `grace_hours`, and any job unseen for `max_age_days` (the only
+    closure signal for sources that never return a full snapshot).
+    """
+    columns = ",".join(JOB_COLUMNS)
+
+    async def op(db):
+        await db.execute(
+            "UPDATE jobs SET closed = 1 WHERE closed = 0 AND last_seen < datetime('now', ?)",
+            (f"-{max_age_days} days",)
+        )
+        expired = "closed = 1 AND last_seen < datetime('now', ?)"
+        cutoff  = (f"-{grace_hours} hours",)
+        await db.execute(
+            f"INSERT OR REPLACE INTO jobs_archive({columns}, archived_at) "
+            f"SELECT {columns}, datetime('now') FROM jobs WHERE {expired}",
+            cutoff
+        )
+        cursor = await db.execute(f"DELETE FROM jobs WHERE {expired}", cutoff)
+        return cursor.rowcount
+
+    archived = await db_manager.submit("archive_closed_jobs", op)
+    SEARCH_CACHE.bump()
+    return archived
+
+
+async def load_job_titles():
+    """(id, title, company) of every stored job, for reclassification."""
+    async with db_manager.read() as db:
+        return await db.execute_fetchall("SELECT id, title, company FROM jobs")
+
+
+async def load_unfingerprinted_jobs():
+    """(id, company, title, location, apply_link) of jobs stored without a fingerprint, oldest first."""
+    async with db_manager.read() as db:
+        return await db.execute_fetchall(
+            "SELECT id, company, title, location, apply_link FROM jobs "
+            "WHERE fingerprint IS NULL ORDER BY first_seen"
+        )
+
+
+async def set_fingerprints(fingerprints: dict) -> int:
+    """
+    fingerprints: job id → fingerprint. A fingerprint another row already
+    holds is skipped (those rows were stored as duplicates); returns how many
+    were set.
+    """
+    async def op(db):
+        cursor = await db.executemany(
+            "UPDATE OR IGNORE jobs SET fingerprint = ? WHERE id = ? AND fingerprint IS NULL",
+            [(fp, job_id) for job_id, fp in fingerprints.items()]
+        )
+        return cursor.rowcount
+
+    return await db_manager.submit("set_fingerprints", op)
+
+
+async def replace_job_tags(tags: dict):
+    """
+    tags: job id → (category, skills, company_key). Rewrites the categories
+    and company keys that changed and the whole job_skills table in one
+    transaction.
+    """
+    async def op(db):
+        await db.executemany(
+            "UPDATE jobs SET category = ?, company_key = ? WHERE id = ? "
+            "AND (category IS NOT ? OR company_key IS NOT ?)",
+            [(category, key, job_id, category, key) for job_id, (category, _, key) in tags.items()]
+        )
+        await db.execute("DELETE FROM job_skills")
+        await db.executemany(
+            "INSERT INTO job_skills(skill, job_id) VALUES(?,?)",
+            [(skill, job_id) for job_id, (_, skills, _) in tags.items() for skill in skills]
+        )
+
+    await db_manager.submit("replace_job_tags", op)
+    SEARCH_CACHE.bump()
+
+
+async def load_company_map():
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("SELECT name, company_key FROM company_map")
+        return dict(rows)
+
+
+async def save_company_map(entries: dict):
+    """entries: normalized name → company key (learned, not manual)"""
+    if not entries:
+        return
+    async def op(db):
+        await db.executemany(
+            "INSERT OR IGNORE INTO company_map(name, company_key) VALUES(?,?)",
+            list(entries.items())
+        )
+
+    await db_manager.submit("save_company_map", op)
+
+
+async def forget_learned_companies():
+    """Drop learned mappings (the alias table changed); manual ones stay."""
+    async def op(db):
+        await db.execute("DELETE FROM company_map WHERE manual = 0")
+
+    await db_manager.submit("forget_learned_companies", op)
+
+
+# ─────────────────────────────────────────────────────
+# META (small key/value settings)
+# ─────────────────────────────────────────────────────
+async def get_meta(key: str):
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("SELECT value FROM meta WHERE key=?", (key,))
+        return rows[0][0] if rows else None
+
+
+async def set_meta(key: str, value: str):
+    async def op(db):
+        await db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES(?,?)", (key, value))
+
+    await db_manager.submit("set_meta", op)
+
+
+# ─────────────────────────────────────────────────────
+# HTTP VALIDATOR CACHE
+# ─────────────────────────────────────────────────────
+async def load_http_cache():
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall(
+            "SELECT key, etag, last_modified, content_hash FROM http_cache"
+        )
+        return {r[0]: (r[1], r[2], r[3]) for r in rows}
+
+
+async def save_http_cache(entries: dict):
+    """entries: key → (etag, last_modified, content_hash)"""
+    if not entries:
+        return
+    async def op(db):
+        await db.executemany(
+            "INSERT OR REPLACE INTO http_cache(key, etag, last_modified, content_hash) VALUES(?,?,?,?)",
+            [(k, *v) for k, v in entries.items()]
+        )
+
+    await db_manager.submit("save_http_cache", op)
+
+
+# ─────────────────────────────────────────────────────
+# CRAWL STATE (incremental pagination)
+# ─────────────────────────────────────────────────────
+async def load_crawl_state():
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("SELECT source, recent_ids FROM crawl_state")
+        return {r[0]: json.loads(r[1]) for r in rows}
+
+
+async def save_crawl_state(entries: dict):
+    """entries: source → list of newest seen job ids"""
+    if not entries:
+        return
+    async def op(db):
+        await db.executemany(
+            "INSERT OR REPLACE INTO crawl_state(source, recent_ids, updated_at) "
+            "VALUES(?,?,datetime('now'))",
+            [(k, json.dumps(v)) for k, v in entries.items()]
+        )
+
+    await db_manager.submit("save_crawl_state", op)
+
+
+# ─────────────────────────────────────────────────────
+# CIRCUIT BREAKERS
+# ─────────────────────────────────────────────────────
+async def load_breakers():
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("SELECT source, failures, open_until FROM circuit_breakers")
+        return {r[0]: (r[1], r[2]) for r in rows}
+
+
+async def save_breakers(entries: dict):
+    """entries: source → (consecutive failures, open_until epoch)"""
+    if not entries:
+        return
+    async def op(db):
+        await db.executemany(
+            "INSERT OR REPLACE INTO circuit_breakers(source, failures, open_until) VALUES(?,?,?)",
+            [(k, *v) for k, v in entries.items()]
+        )
+
+    await db_manager.submit("save_breakers", op)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -171,107 +758,256 @@ SKILL_KEYWORDS = {
 }
 
 
-def _skill_filter(skill: str):
-    """Build SQL WHERE clause for skill — searches both title and category."""
-    if skill == "Any":
-        return "1=1", []
+def _fts_phrase(keyword: str) -> str:
+    """
+    One LIKE '%kw%' keyword as an FTS5 phrase. FTS matches whole tokens, so
+    the last token becomes a prefix ("java" still matches "javascript")
+    unless the keyword ends in a separator ("sde " only matches "sde").
+    """
+    phrase = '"' + keyword.strip().replace('"', '""') + '"'
+    return phrase + "*" if keyword[-1:].isalnum() else phrase
 
+
+def _skill_match(skill: str):
+    """FTS5 MATCH expression for a skill, or None when it does not filter."""
+    if skill == "Any":
+        return None
     keywords = SKILL_KEYWORDS.get(skill, [skill.lower()])
     if not keywords:
+        return None
+    return " OR ".join(_fts_phrase(kw) for kw in keywords)
+
+
+def _skill_source(skill: str, ranked: bool = False):
+    """
+    FROM clause restricted to a skill's jobs, its params, and the ORDER BY to
+    use (posting recency, or BM25 when `ranked`). Known skills are an index
+    lookup on the job_skills tags written at ingest; free-text skills, and
+    relevance ranking, go through jobs_fts.
+    """
+    match = _skill_match(skill)
+    if match is None:
+        return "jobs", [], "jobs.posted_at DESC"
+    if skill in SKILL_KEYWORDS and not ranked:
+        source = "jobs JOIN job_skills ON job_skills.job_id = jobs.id AND job_skills.skill = ?"
+        return source, [skill], "jobs.posted_at DESC"
+    source = (
+        "jobs JOIN (SELECT rowid, rank FROM jobs_fts WHERE jobs_fts MATCH ?) AS fts "
+        "ON jobs.seq = fts.rowid"
+    )
+    return source, [match], "fts.rank, jobs.posted_at DESC" if ranked else "jobs.posted_at DESC"
+
+
+def _since_filter(since_hours: Optional[int]):
+    """Recency window on posted_at (idx_jobs_posted range), to the minute."""
+    if not since_hours:
         return "1=1", []
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+    return "jobs.posted_at >= ?", [cutoff.strftime("%Y-%m-%d %H:%M:00")]
 
-    parts, params = [], []
-    for kw in keywords:
-        parts.append("LOWER(title) LIKE ?")
-        params.append(f"%{kw}%")
-        parts.append("LOWER(category) LIKE ?")
-        params.append(f"%{kw}%")
 
-    return "(" + " OR ".join(parts) + ")", params
+def company_key_of(company: str) -> Optional[str]:
+    """The jobs.company_key a company choice matches, None for "Any"."""
+    if company == "Any":
+        return None
+    return company if company in COMPANY_ALIASES else normalize_company(company)
 
 
 def _company_filter(company: str):
-    """Build SQL WHERE clause for company name matching."""
-    if company == "Any":
+    """Build SQL WHERE clause for company name matching (indexed company_key)."""
+    key = company_key_of(company)
+    if key is None:
         return "1=1", []
-    aliases = COMPANY_ALIASES.get(company, [company.lower()])
-    parts  = ["LOWER(company) LIKE ?"] * len(aliases)
-    params = [f"%{a}%" for a in aliases]
-    return "(" + " OR ".join(parts) + ")", params
+    return "company_key = ?", [key]
 
 
 # ─────────────────────────────────────────────────────
 # SEARCH
 # ─────────────────────────────────────────────────────
-async def search_jobs(skill: str, company: str, limit: int = 8):
-    async with aiosqlite.connect(DB_NAME) as db:
-
-        skill_sql,   skill_params   = _skill_filter(skill)
+async def search_jobs(skill: str, company: str, limit: int = 8, ranked: bool = SEARCH_BM25,
+                      since_hours: Optional[int] = None):
+    """
+    Most recently posted open jobs for skill + company, optionally only those
+    posted in the last `since_hours`; `ranked` orders by BM25 relevance
+    instead. Served from SEARCH_CACHE until the next write that changes jobs.
+    """
+    since_sql, since_params = _since_filter(since_hours)
+    key        = (skill, company, limit, ranked, *since_params)
+    generation = SEARCH_CACHE.generation
+    cached     = SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    async with db_manager.read() as db:
+
+        source, skill_params, order = _skill_source(skill, ranked)
         company_sql, company_params = _company_filter(company)
+        columns = "title, company, location, category, apply_link, source, COALESCE(sources, source)"
 
         # Primary: skill + company
         query = f"""
-            SELECT title, company, location, category, apply_link, source
-            FROM jobs
-            WHERE {skill_sql} AND {company_sql}
-            ORDER BY rowid DESC
+            SELECT {columns}
+            FROM {source}
+            WHERE closed = 0 AND {since_sql} AND {company_sql}
+            ORDER BY {order}
             LIMIT ?
         """
-        cursor = await db.execute(query, skill_params + company_params + [limit])
+        cursor = await db.execute(query, skill_params + since_params + company_params + [limit])
         rows   = await cursor.fetchall()
 
         # Fallback: if specific company has no match, search skill across all companies
         if not rows and company != "Any":
             print(f"[search] No '{skill}' at {company} — showing all companies")
             cursor = await db.execute(
-                f"SELECT title, company, location, category, apply_link, source FROM jobs WHERE {skill_sql} ORDER BY rowid DESC LIMIT ?",
-                skill_params + [limit]
+                f"SELECT {columns} FROM {source} WHERE closed = 0 AND {since_sql} ORDER BY {order} LIMIT ?",
+                skill_params + since_params + [limit]
             )
             rows = await cursor.fetchall()
 
-        return [
-            {"title": r[0], "company": r[1], "location": r[2],
-             "category": r[3], "apply_link": r[4], "source": r[5]}
-            for r in rows
-        ]
+    jobs = [
+        {"title": r[0], "company": r[1], "location": r[2],
+         "category": r[3], "apply_link": r[4], "source": r[5], "sources": r[6].split(",")}
+        for r in rows
+    ]
+    SEARCH_CACHE.put(key, generation, jobs)
+    return jobs
 
 
 # ─────────────────────────────────────────────────────
 # NOTIFICATIONS
 # ─────────────────────────────────────────────────────
-async def get_unnotified_jobs(chat_id: int, skill: str, company: str):
-    async with aiosqlite.connect(DB_NAME) as db:
-        skill_sql,   skill_params   = _skill_filter(skill)
-        company_sql, company_params = _company_filter(company)
-
-        query = f"""
-            SELECT id, title, company, location, apply_link
+NOTIFY_BATCH = 5   # alerts per user per tick
+
+
+async def current_seq() -> int:
+    async with db_manager.read() as db:
+        return (await db.execute_fetchall(f"SELECT {_CURRENT_SEQ}"))[0][0] or 0
+
+
+async def seq_before(since: str) -> int:
+    """
+    Ingest sequence just before the first job first seen at or after `since`
+    (idx_jobs_first_seen), or the current one if there is none.
+    """
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("""
+            SELECT MIN(seq) FROM jobs
+            WHERE first_seen = (SELECT MIN(first_seen) FROM jobs WHERE first_seen >= ?)
+        """, (since,))
+        if rows[0][0] is not None:
+            return rows[0][0] - 1
+        return (await db.execute_fetchall(f"SELECT {_CURRENT_SEQ}"))[0][0] or 0
+
+
+async def get_jobs_since(seq: int) -> list:
+    """
+    Open jobs ingested after `seq`, oldest first, with their job_skills tags
+    and company key: the only rows alert matching has to look at.
+    """
+    async with db_manager.read() as db:
+        rows = await db.execute_fetchall("""
+            SELECT id, title, company, location, apply_link, seq, company_key,
+                   (SELECT group_concat(skill, char(31)) FROM job_skills WHERE job_id = jobs.id)
             FROM jobs
-            WHERE id NOT IN (SELECT job_id FROM notified WHERE chat_id=?)
-              AND {skill_sql} AND {company_sql}
-            ORDER BY rowid DESC
-            LIMIT 5
-        """
-        cursor = await db.execute(query, [chat_id] + skill_params + company_params)
-        rows   = await cursor.fetchall()
-        return [{"id": r[0], "title": r[1], "company": r[2],
-                 "location": r[3], "apply_link": r[4]} for r in rows]
+            WHERE seq > ? AND closed = 0
+            ORDER BY seq
+        """, (seq,))
+    return [{"id": r[0], "title": r[1], "company": r[2], "location": r[3], "apply_link": r[4],
+             "seq": r[5], "company_key": r[6], "skills": set(r[7].split("\x1f")) if r[7] else set()}
+            for r in rows]
+
+
+async def match_skill_since(skill: str, seq: int) -> set:
+    """Ids of open jobs after `seq` matching a free-text skill (jobs_fts)."""
+    async with db_manager.read() as db:
+        source, params, _ = _skill_source(skill)
+        rows = await db.execute_fetchall(
+            f"SELECT jobs.id FROM {source} WHERE jobs.seq > ? AND closed = 0", params + [seq]
+        )
+    return {r[0] for r in rows}
 
 
-async def mark_notified(chat_id: int, job_id: str):
-    async with aiosqlite.connect(DB_NAME) as db:
+NOTIFIED_CHUNK = 500   # job ids per lookup, well under SQLite's parameter limit
+
+
+async def get_notified(job_ids: list) -> set:
+    """(chat_id, job_id) pairs already alerted among these jobs (the dedup log)."""
+    pairs = set()
+    async with db_manager.read() as db:
+        for i in range(0, len(job_ids), NOTIFIED_CHUNK):
+            chunk = job_ids[i:i + NOTIFIED_CHUNK]
+            rows  = await db.execute_fetchall(
+                f"SELECT chat_id, job_id FROM notified WHERE job_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            pairs.update((r[0], r[1]) for r in rows)
+    return pairs
+
+
+async def mark_notified(chat_id: int, job_ids: list, seq: int):
+    """An alert for these jobs (up to `seq`) was delivered: log them and move the watermark."""
+    async def op(db):
+        await db.executemany(
+            "INSERT OR IGNORE INTO notified(chat_id, job_id, sent_at) VALUES(?,?,datetime('now'))",
+            [(chat_id, job_id) for job_id in job_ids]
+        )
         await db.execute(
-            "INSERT OR IGNORE INTO notified(chat_id, job_id) VALUES(?,?)",
-            (chat_id, job_id)
+            "UPDATE users SET watermark = MAX(watermark, ?) WHERE chat_id=?", (seq, chat_id)
+        )
+
+    await db_manager.submit("mark_notified", op)
+
+
+async def advance_watermarks(chat_ids, seq: int):
+    """Nothing (more) matched up to `seq` for these users: skip those jobs next tick."""
+    if not chat_ids:
+        return
+
+    async def op(db):
+        await db.executemany(
+            "UPDATE users SET watermark = MAX(watermark, ?) WHERE chat_id=?",
+            [(seq, chat_id) for chat_id in chat_ids]
+        )
+
+    await db_manager.submit("advance_watermarks", op)
+
+
+async def prune_notified(days: int) -> int:
+    async def op(db):
+        cursor = await db.execute(
+            "DELETE FROM notified WHERE sent_at < datetime('now', ?)", (f"-{days} days",)
         )
-        await db.commit()
+        return cursor.rowcount
+
+    return await db_manager.submit("prune_notified", op)
 
 
 # ─────────────────────────────────────────────────────
 # STATS
 # ─────────────────────────────────────────────────────
-async def get_stats():
-    async with aiosqlite.connect(DB_NAME) as db:
-        job_count  = await db.execute_fetchone("SELECT COUNT(*) FROM jobs")
-        user_count = await db.execute_fetchone("SELECT COUNT(*) FROM users")
-        return job_count[0], user_count[0]
\ No newline at end of file
+STATS_TOP = 5    # rows shown per breakdown in /stats
+
+
+async def get_stats() -> dict:
+    """
+    Totals plus the biggest sources, categories and companies and the last
+    week of daily ingest counts, all read from the stats counters.
+    """
+    async with db_manager.read() as db:
+        totals = dict(await db.execute_fetchall("SELECT key, n FROM stats WHERE dim = 'total'"))
+
+        async def top(dim: str, order: str = "n DESC", limit: int = STATS_TOP):
+            return await db.execute_fetchall(
+                f"SELECT key, n FROM stats WHERE dim = ? AND n > 0 AND key != '' "
+                f"ORDER BY {order} LIMIT ?", (dim, limit)
+            )
+
+        return {
+            "jobs":       totals.get("jobs", 0),
+            "open":       totals.get("jobs", 0) - totals.get("closed", 0),
+            "users":      totals.get("users", 0),
+            "sources":    await top("source"),
+            "categories": await top("category"),
+            "companies":  await top("company"),
+            "days":       await top("day", order="key DESC", limit=7),
+        }
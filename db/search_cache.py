@@ -0,0 +1,47 @@
+"""
+db/search_cache.py — In-process LRU cache for search_jobs results.
+
+Results only change when jobs are written, so instead of a TTL every entry
+carries the data generation it was computed at. Writes that change what a
+search can return call bump(); entries from an older generation are misses.
+"""
+
+from collections import OrderedDict
+from config import SEARCH_CACHE_SIZE
+
+
+class SearchCache:
+    def __init__(self, size: int = SEARCH_CACHE_SIZE):
+        self.size       = size          # 0 disables the cache
+        self.generation = 0
+        self.hits       = 0
+        self.misses     = 0
+        self._entries   = OrderedDict()   # key → (generation, rows)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.generation:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, generation: int, rows):
+        """`generation` as read before the query ran, so a concurrent bump wins."""
+        if self.size <= 0:
+            return
+        self._entries[key] = (generation, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def bump(self):
+        self.generation += 1
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+SEARCH_CACHE = SearchCache()
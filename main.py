@@ -5,13 +5,16 @@ from telegram.ext import (
     CallbackQueryHandler
 )
 from config import TELEGRAM_TOKEN
-from db.database import init_db
+from db.database import init_db, close_db
 from core.collector import collect_all_jobs
+from core.delivery import DELIVERY
+from core.http_pool import HttpPool
 from core.matcher import notify_users
+from core.retag import ensure_tags
 from core.scheduler import start_scheduler
 from bot.handlers import (
     start, update_prefs, search, profile,
-    stats, help_cmd, cancel,
+    stats, help_cmd, cancel, mode_cmd,
     on_skill_chosen, on_company_chosen,
     PICK_SKILL, PICK_COMPANY
 )
@@ -19,22 +22,36 @@ from bot.handlers import (
 
 async def post_init(application):
     await init_db()
+    await ensure_tags()
     print("✅ Database ready")
+
+    http = HttpPool()
+    application.bot_data["http"] = http
+    DELIVERY.start(application.bot)
     print("🤖 Bot started!")
 
     print("🔍 Running first job fetch...")
-    await collect_all_jobs()
+    await collect_all_jobs(http)
 
-    await notify_users(application.bot)
-    start_scheduler(application.bot)
+    await notify_users()
+    start_scheduler(http)
     print("🚀 All systems running!")
 
 
+async def post_shutdown(application):
+    await DELIVERY.stop()
+    http = application.bot_data.pop("http", None)
+    if http is not None:
+        await http.close()
+    await close_db()
+
+
 def main():
     app = (
         ApplicationBuilder()
         .token(TELEGRAM_TOKEN)
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -58,6 +75,7 @@ def main():
     app.add_handler(conv_handler)
     app.add_handler(CommandHandler("search",  search))
     app.add_handler(CommandHandler("profile", profile))
+    app.add_handler(CommandHandler("mode",    mode_cmd))
     app.add_handler(CommandHandler("stats",   stats))
     app.add_handler(CommandHandler("help",    help_cmd))
 
@@ -0,0 +1,6 @@
+"""Point the app at a scratch database before anything imports config."""
+
+import os
+import tempfile
+
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(), "test_jobs.db")
@@ -0,0 +1,54 @@
+"""The compiled classifier against the legacy chained checks, on fixed titles."""
+
+import pytest
+from bench.classifier_bench import legacy_categorize, legacy_skills
+from core.classifier import CLASSIFIER, classify
+
+TITLES = [
+    "Senior React Developer",
+    "Node.js Engineer, Payments",
+    "Staff Software Engineer — TypeScript",
+    "Python Developer (Remote)",
+    "Java, Spring Boot Engineer",
+    "Kotlin Developer",
+    "Machine Learning Engineer, NLP",
+    "Data Scientist",
+    "Site Reliability Engineer, Kubernetes",
+    "Android Engineer",
+    "iOS Developer",
+    "SDET II",
+    "Product Designer",
+    "Full-Stack Developer / NextJS",
+    "Frontend Developer",
+    "Backend Engineer - Infrastructure",
+    "Javascript Engineer",
+    "Recruiter",
+    "Account Executive, Bioscience",
+    "",
+]
+
+
+@pytest.mark.parametrize("title", TITLES)
+def test_matches_legacy(title):
+    category, skills = CLASSIFIER.classify(title)
+    assert category == legacy_categorize(title)
+    assert skills == legacy_skills(title, category)
+
+
+@pytest.mark.parametrize("title, category", [
+    ("Senior React Developer",             "React"),
+    ("Java, Spring Boot Engineer",         "Java"),
+    ("Site Reliability Engineer, Docker",  "DevOps"),
+    ("Full Stack Engineer",                "Full Stack"),
+    ("Recruiter",                          "Software Engineering"),
+])
+def test_category(title, category):
+    assert CLASSIFIER.categorize(title) == category
+    assert classify(title)[0] == category
+
+
+def test_first_rule_wins():
+    # "React" is checked before "Python" and "Backend", as in the old chain
+    category, skills = classify("Backend Python Engineer, React")
+    assert category == "React"
+    assert {"React", "Python", "Backend"} <= set(skills)
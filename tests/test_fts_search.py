@@ -0,0 +1,90 @@
+"""/search through job_skills and jobs_fts against the old LIKE filter, on fixed titles."""
+
+import asyncio
+import sqlite3
+import pytest
+from bench.fts_bench import legacy_filter, mid_word_only
+from config import DB_PATH
+from core.classifier import classify
+from db.database import SKILL_KEYWORDS, close_db, init_db, save_jobs, search_jobs
+from db.search_cache import SEARCH_CACHE
+
+TITLES = [
+    "Senior Python Developer",
+    "Backend Engineer (Python, Django)",
+    "React Developer",
+    "Full Stack Engineer, Node",
+    "Java, Spring Boot Engineer",
+    "Site Reliability Engineer, Kubernetes",
+    "Machine Learning Engineer, NLP",
+    "Data Scientist",
+    "iOS Developer",
+    "Account Executive, Bioscience",
+    "QA Engineer",
+    "Android Engineer",
+    "Golang Developer",
+    "Recruiter",
+]
+SKILLS = [s for s in SKILL_KEYWORDS if s != "Any"]
+
+
+def _run(fn):
+    async def main():
+        await init_db()
+        try:
+            return await fn()
+        finally:
+            await close_db()
+    return asyncio.run(main())
+
+
+def _links(jobs) -> set:
+    return {job["apply_link"] for job in jobs}
+
+
+@pytest.fixture(scope="module")
+def rows():
+    jobs = [
+        {"id": f"t{i}", "title": t, "company": "Acme", "location": "Remote",
+         "category": classify(t)[0], "skills": classify(t)[1],
+         "apply_link": f"https://example.com/{i}", "source": "Test"}
+        for i, t in enumerate(TITLES)
+    ]
+    _run(lambda: save_jobs(jobs, "2026-01-01 00:00:00"))
+    with sqlite3.connect(DB_PATH) as conn:
+        return {r[0]: r[1:] for r in conn.execute("SELECT apply_link, title, category FROM jobs")}
+
+
+def _legacy(skill: str) -> set:
+    sql, params = legacy_filter(skill)
+    with sqlite3.connect(DB_PATH) as conn:
+        return {r[0] for r in conn.execute(f"SELECT apply_link FROM jobs WHERE {sql}", params)}
+
+
+@pytest.mark.parametrize("skill", SKILLS)
+def test_tags_match_like(rows, skill):
+    assert _links(_run(lambda: search_jobs(skill, "Any", limit=100))) == _legacy(skill)
+
+
+@pytest.mark.parametrize("skill", SKILLS)
+def test_fts_matches_like(rows, skill):
+    want = _legacy(skill)
+    got  = _links(_run(lambda: search_jobs(skill, "Any", limit=100, ranked=True)))
+    assert got <= want
+    # FTS only misses keywords buried inside a word ("ios" in "Bioscience")
+    assert all(mid_word_only(skill, *rows[link]) for link in want - got)
+
+
+def test_free_text_skill(rows):
+    assert _links(_run(lambda: search_jobs("Golang", "Any", limit=100))) == _legacy("Golang")
+
+
+def test_survives_vacuum(rows):
+    # Deleting an early row leaves a gap VACUUM is free to close up in jobs.rowid
+    before = _links(_run(lambda: search_jobs("Python", "Any", limit=100, ranked=True)))
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.execute("DELETE FROM jobs WHERE title = 'React Developer'")
+        conn.commit()
+        conn.execute("VACUUM")
+    SEARCH_CACHE.bump()
+    assert _links(_run(lambda: search_jobs("Python", "Any", limit=100, ranked=True))) == before
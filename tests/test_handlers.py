@@ -0,0 +1,33 @@
+"""/search window parsing: accepted forms and the SEARCH_MAX_DAYS cap."""
+
+import asyncio
+
+import pytest
+from bot.handlers import parse_window
+from config import SEARCH_MAX_DAYS
+from db.database import close_db, init_db, search_jobs
+
+LONGEST = SEARCH_MAX_DAYS * 24
+
+
+@pytest.mark.parametrize("args, hours", [
+    ([], 0), (["24h"], 24), (["3d"], 72), (["12"], 12), (["3", "d"], 72), (["soon"], 0),
+])
+def test_window_forms(args, hours):
+    assert parse_window(args) == hours
+
+
+@pytest.mark.parametrize("args", [["100000000d"], ["9" * 5000], ["9" * 5000 + "h"], ["400d"]])
+def test_oversized_window_is_capped(args):
+    assert parse_window(args) == LONGEST
+
+
+def test_capped_window_searches():
+    async def go():
+        await init_db()
+        try:
+            return await search_jobs(skill="Any", company="Any", since_hours=parse_window(["100000000d"]))
+        finally:
+            await close_db()
+
+    assert isinstance(asyncio.run(go()), list)
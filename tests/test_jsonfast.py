@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from core.jsonfast import ItemReader, ItemScanner, iter_items
+
+JOBS = [
+    {"id": i, "title": f"Ingénieur 🚀 {i} \"senior\" \\ ]}}", "location": {"name": "Zürich"},
+     "metadata": [1, {"value": "]"}]}
+    for i in range(30)
+]
+BODY = json.dumps(
+    {"meta": {"jobs": [0]}, "note": "\"jobs\": [", "jobs": JOBS, "tail": {"jobs": []}},
+    ensure_ascii=False,
+).encode()
+WANT = [{"id": j["id"], "title": j["title"]} for j in JOBS]
+
+
+def _scan(body, key, fields, size):
+    scanner, items = ItemScanner(key, fields), []
+    for start in range(0, len(body), size):
+        items.extend(scanner.feed(body[start:start + size]))
+    scanner.close()
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, len(BODY)])
+def test_scanner_matches_full_decode_for_any_chunking(size):
+    assert _scan(BODY, "jobs", ("id", "title"), size) == WANT
+
+
+def test_top_level_array_and_missing_key():
+    body = json.dumps([{"id": "a", "text": "é"}, 5, {"id": "b"}], ensure_ascii=False).encode()
+    assert list(iter_items(body, None, ("id",))) == [{"id": "a"}, {"id": "b"}]
+    assert list(iter_items(b'{"other": [{"id": 1}]}', "jobs", ("id",))) == []
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        _scan(BODY[:-20], "jobs", ("id",), 64)
+
+
+def test_reader_switches_to_scanning_past_threshold():
+    small = ItemReader("jobs", ("id",), len(BODY) + 1, lambda d: d["jobs"])
+    small.feed(BODY)
+    assert small.close() == JOBS
+
+    big = ItemReader("jobs", ("id",), 100, lambda d: d["jobs"])
+    for start in range(0, len(BODY), 50):
+        big.feed(BODY[start:start + 50])
+    assert big.close() == [{"id": j["id"]} for j in JOBS]